@@ -0,0 +1,14 @@
+"""Gunicorn settings picked up by `make render-start(-asgi)`."""
+import logging
+
+logger = logging.getLogger('gunicorn.error')
+
+
+def post_worker_init(worker):
+    """Preload the hot lookups once the worker has loaded Django."""
+    from django.core.management import call_command
+    try:
+        call_command('warm_caches', verbosity=0)
+    except Exception:
+        # A cold cache only slows the first requests down.
+        logger.exception('Could not warm the caches')
@@ -0,0 +1,13 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('tasks/',
+         views.TaskListAPIView.as_view(), name='api_task_list'),
+    path('statuses/',
+         views.StatusListAPIView.as_view(), name='api_status_list'),
+    path('labels/',
+         views.LabelListAPIView.as_view(), name='api_label_list'),
+    path('users/',
+         views.UserListAPIView.as_view(), name='api_user_list'),
+]
@@ -0,0 +1,157 @@
+"""Read-only JSON endpoints over the task manager models.
+
+Every list accepts ``fields=`` (comma-separated) to load and return only
+some columns, is paginated with the same cursors as the HTML lists and
+answers conditional requests from the version stamps of the tables it
+reads.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
+from django.http import JsonResponse
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                quote_etag)
+from django.utils.translation import gettext as _
+from django.views import View
+
+from task_manager.labels.models import Label
+from task_manager.pagination import (KeysetPaginationMixin, build_page,
+                                     build_page_queryset)
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.versions import get_versions
+
+
+class ModelListAPIView(LoginRequiredMixin, KeysetPaginationMixin, View):
+    """Cursor-paginated JSON list of ``model`` rows."""
+    raise_exception = True
+    model = None
+    fields = ()
+    version_names = ()
+    fields_kwarg = 'fields'
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_fields(self):
+        """Return the requested field names or ``None`` if one of them is
+        unknown."""
+        requested = self.request.GET.get(self.fields_kwarg, '')
+        names = [name.strip() for name in requested.split(',')
+                 if name.strip()]
+        if not names:
+            return list(self.fields)
+        if not set(names) <= set(self.fields):
+            return None
+        return list(dict.fromkeys(names))
+
+    def get_etag(self, versions, fields):
+        # The rows also depend on the user through filters like my_tasks.
+        key = repr((sorted(versions.items()), self.request.user.pk,
+                    self.request.get_full_path(), fields,
+                    settings.CODE_VERSION))
+        return quote_etag(hashlib.md5(key.encode(),
+                                      usedforsecurity=False).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        if fields is None:
+            return JsonResponse(
+                {'error': _('Unknown field. Available fields: %(fields)s')
+                 % {'fields': ', '.join(self.fields)}}, status=400)
+        versions = get_versions(*self.version_names)
+        # No Last-Modified: a date can't express the user and field parts
+        # of the ETag, and whole seconds would miss a write made in the
+        # same second as the response.
+        etag = self.get_etag(versions, fields)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = JsonResponse(self.get_data(fields))
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_data(self, fields):
+        ordering = self.get_cursor_ordering()
+        page_size = self.get_paginate_by(None)
+        queryset, backwards = build_page_queryset(
+            self.load_fields(self.get_queryset(), fields, ordering),
+            ordering, page_size, self.request.GET)
+        page = build_page(queryset, ordering, page_size, self.request.GET,
+                          backwards)
+        return {
+            'results': [self.serialize(obj, fields) for obj in page],
+            'next': self._page_url(page.next_url),
+            'previous': self._page_url(page.previous_url),
+        }
+
+    def load_fields(self, queryset, fields, ordering):
+        """Restrict the query to ``fields`` and the ordering columns."""
+        columns, related = [], []
+        for name in fields:
+            field = self.model._meta.get_field(name)
+            if field.many_to_many:
+                related.append(Prefetch(
+                    name, queryset=field.related_model.objects.only('pk')))
+            else:
+                columns.append(name)
+        columns += [name.lstrip('-') for name in ordering
+                    if self._is_field(name.lstrip('-'))]
+        return queryset.only(*columns).prefetch_related(*related)
+
+    def serialize(self, obj, fields):
+        data = {}
+        for name in fields:
+            field = self.model._meta.get_field(name)
+            if field.many_to_many:
+                data[name] = [related.pk
+                              for related in getattr(obj, name).all()]
+            else:
+                data[name] = getattr(obj, field.attname)
+        return data
+
+    def _is_field(self, name):
+        return any(field.name == name
+                   for field in self.model._meta.concrete_fields)
+
+    def _page_url(self, query):
+        return self.request.build_absolute_uri(
+            f'{self.request.path}{query}') if query else None
+
+
+class TaskListAPIView(ModelListAPIView):
+    model = Task
+    fields = ('id', 'name', 'description', 'status', 'creator',
+              'executor', 'labels', 'created_at')
+    version_names = ('tasks',)
+
+    def get_queryset(self):
+        return Task.objects.filter_by_params(self.request.GET,
+                                             self.request.user)
+
+    def get_cursor_ordering(self):
+        if self.request.GET.get('q', '').strip():
+            return ('-search_rank', 'id')
+        return super().get_cursor_ordering()
+
+
+class StatusListAPIView(ModelListAPIView):
+    model = Status
+    fields = ('id', 'name', 'created_at')
+    version_names = ('statuses',)
+
+
+class LabelListAPIView(ModelListAPIView):
+    model = Label
+    fields = ('id', 'name', 'created_at')
+    version_names = ('labels',)
+
+
+class UserListAPIView(ModelListAPIView):
+    model = User
+    fields = ('id', 'username', 'first_name', 'last_name', 'date_joined')
+    version_names = ('users',)
+    cursor_ordering = ('date_joined', 'id')
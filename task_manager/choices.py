@@ -0,0 +1,67 @@
+"""Cached ``(id, name)`` choices for the status, executor and label pickers.
+
+The lookup tables behind the task filters and the task form change rarely,
+so their choices are kept in the cache under the table's version stamp
+(see ``task_manager.versions``). A write moves the stamp on for every
+worker, so none of them keeps reading the old list from its own cache;
+old entries just expire.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from task_manager.labels.models import Label
+from task_manager.routers import primary_reads
+from task_manager.statuses.models import Status
+from task_manager.versions import get_version
+
+CACHE_KEY = 'choices:{}:{}'
+
+
+def _load_statuses():
+    return list(Status.objects.order_by('pk').values_list('pk', 'name'))
+
+
+def _load_labels():
+    return list(Label.objects.order_by('pk').values_list('pk', 'name'))
+
+
+def _load_users():
+    rows = User.objects.order_by('pk').values_list(
+        'pk', 'first_name', 'last_name', 'username')
+    return [(pk, f'{first_name} {last_name}'.strip() or username)
+            for pk, first_name, last_name, username in rows]
+
+
+LOADERS = {
+    'statuses': _load_statuses,
+    'labels': _load_labels,
+    'users': _load_users,
+}
+
+
+def get_choices(name, version=None):
+    """Choices of ``name``; pass its ``version`` when it was already
+    read, e.g. for the page's ETag."""
+    if version is None:
+        version = get_version(name)
+    key = CACHE_KEY.format(name, version)
+    choices = cache.get(key)
+    if choices is None:
+        # A stale list read from a lagging replica would stay cached.
+        with primary_reads():
+            choices = LOADERS[name]()
+        cache.set(key, choices, settings.CHOICES_CACHE_TIMEOUT)
+    return choices
+
+
+def get_status_choices(version=None):
+    return get_choices('statuses', version)
+
+
+def get_label_choices(version=None):
+    return get_choices('labels', version)
+
+
+def get_user_choices(version=None):
+    return get_choices('users', version)
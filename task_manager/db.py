@@ -0,0 +1,81 @@
+"""Connection metrics for sizing workers and connection pools.
+
+The numbers describe the process answering the scrape: every gunicorn
+worker has its own persistent connections or pool.
+"""
+import threading
+from collections import Counter
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from task_manager.metrics import register_collector
+
+_opened = Counter()
+_lock = threading.Lock()
+
+# psycopg_pool ``get_stats()`` keys exported as counters and gauges.
+POOL_COUNTERS = {
+    'requests_num': ('db_pool_requests_total',
+                     'Connections requested from the pool.'),
+    'requests_queued': ('db_pool_requests_queued_total',
+                        'Requests that waited for a free connection.'),
+    'requests_errors': ('db_pool_requests_errors_total',
+                        'Requests that timed out waiting for a '
+                        'connection.'),
+    'connections_lost': ('db_pool_connections_lost_total',
+                         'Connections found broken by the health check.'),
+}
+POOL_GAUGES = {
+    'pool_size': ('db_pool_size', 'Connections managed by the pool.'),
+    'pool_available': ('db_pool_available',
+                       'Idle connections in the pool.'),
+    'pool_max': ('db_pool_max_size', 'Maximum size of the pool.'),
+}
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    with _lock:
+        _opened[connection.alias] += 1
+
+
+def get_pool(alias):
+    connection = connections[alias]
+    if not connection.settings_dict.get('OPTIONS', {}).get('pool'):
+        return None
+    return connection.pool
+
+
+@register_collector
+def collect_connection_metrics():
+    with _lock:
+        opened = dict(_opened)
+    metrics = [(
+        'db_connections_opened_total', 'counter',
+        'Database connections opened by this process (checked out of '
+        'the pool when pooling); a low rate means connections are reused.',
+        [({'alias': alias}, count) for alias, count in opened.items()],
+    )]
+    stats = {}
+    for alias in connections:
+        pool = get_pool(alias)
+        if pool is not None:
+            stats[alias] = pool.get_stats()
+    if not stats:
+        return metrics
+    for key, (name, documentation) in POOL_COUNTERS.items():
+        metrics.append((name, 'counter', documentation, [
+            ({'alias': alias}, values.get(key, 0))
+            for alias, values in stats.items()]))
+    metrics.append((
+        'db_pool_wait_seconds_total', 'counter',
+        'Time requests spent waiting for a pool connection.',
+        [({'alias': alias}, values.get('requests_wait_ms', 0) / 1000)
+         for alias, values in stats.items()]))
+    for key, (name, documentation) in POOL_GAUGES.items():
+        metrics.append((name, 'gauge', documentation, [
+            ({'alias': alias}, values.get(key, 0))
+            for alias, values in stats.items()]))
+    return metrics
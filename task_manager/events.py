@@ -0,0 +1,221 @@
+"""Live feed of task changes.
+
+The signal handlers in ``task_manager.signals`` (and the bulk helpers)
+publish an event per changed task once the writing transaction commits,
+the events of one write going out as a single batch. The configured
+backend carries the batches to every process: ``LocalBackend``
+hands them straight to this process' ``broker``, ``RedisBackend`` goes
+through a Redis channel so that all workers see writes made by any of
+them. The broker fans events out to the asyncio queues of the open
+streams, so an idle stream only costs a pending ``await``.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+class Subscription:
+    """Queue of events for one stream, owned by the stream's event loop.
+
+    A subscriber that falls ``maxsize`` events behind is dropped: its
+    queue is cleared and ``get`` returns ``None`` so the stream can end
+    and the client reconnect and reload.
+    """
+
+    def __init__(self, maxsize):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, events):
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(None)
+                return
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class Broker:
+    """In-process pub/sub between publishing threads and streams."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, maxsize=None):
+        subscription = Subscription(maxsize or settings.EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        get_backend().listen()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def has_subscribers(self):
+        with self._lock:
+            return bool(self._subscriptions)
+
+    def deliver(self, events):
+        """Queue the list of ``events`` for every subscriber; safe to
+        call from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put,
+                                                       events)
+            except RuntimeError:
+                # The subscriber's loop is closed.
+                self.unsubscribe(subscription)
+
+
+broker = Broker()
+
+
+class LocalBackend:
+    """Deliver events to the streams of the publishing process only."""
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def publish(self, events):
+        self.broker.deliver(events)
+
+    def listen(self):
+        pass
+
+    def wants_events(self):
+        """Whether anyone would receive a published event."""
+        return self.broker.has_subscribers()
+
+
+class RedisBackend:
+    """Share events between processes through a Redis pub/sub channel,
+    one message per published batch."""
+    reconnect_delay = 1
+
+    def __init__(self, broker):
+        try:
+            import redis
+        except ImportError as error:
+            raise ImproperlyConfigured(
+                'The redis events backend requires the "redis" package.'
+            ) from error
+        self.broker = broker
+        self.client = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        self.channel = settings.EVENTS_CHANNEL
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def publish(self, events):
+        self.client.publish(self.channel, json.dumps(events))
+
+    def wants_events(self):
+        # Streams may be open in other processes.
+        return True
+
+    def listen(self):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._run, name='task-events', daemon=True)
+                self._listener.start()
+
+    def _run(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self.broker.deliver(json.loads(message['data']))
+            except Exception:
+                logger.exception('Task event listener failed, reconnecting')
+                time.sleep(self.reconnect_delay)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = import_string(settings.EVENTS_BACKEND)(broker)
+        return _backend
+
+
+def publish_task_changes(kind, task_ids, using=None):
+    """Publish ``kind`` events for ``task_ids`` when the current
+    transaction commits.
+
+    Nothing is queued, and no task is loaded, while the backend has no
+    one to deliver to.
+    """
+    task_ids = list(task_ids)
+    if task_ids and get_backend().wants_events():
+        transaction.on_commit(lambda: _publish(kind, task_ids),
+                              using=using, robust=True)
+
+
+def _publish(kind, task_ids):
+    backend = get_backend()
+    if not backend.wants_events():
+        return
+    if kind == DELETED:
+        tasks = [{'id': pk} for pk in task_ids]
+    else:
+        tasks = _load_tasks(task_ids)
+    if tasks:
+        backend.publish([{'event': kind, 'task': task} for task in tasks])
+
+
+def _load_tasks(task_ids):
+    from task_manager.tasks.models import Task, TaskLabel
+    rows = Task.objects.filter(pk__in=task_ids).values_list(
+        'id', 'name', 'status_id', 'creator_id', 'executor_id')
+    tasks = {
+        pk: {'id': pk, 'name': name, 'status': status_id,
+             'creator': creator_id, 'executor': executor_id, 'labels': []}
+        for pk, name, status_id, creator_id, executor_id in rows
+    }
+    links = TaskLabel.objects.filter(task_id__in=tasks).values_list(
+        'task_id', 'label_id')
+    for task_id, label_id in links:
+        tasks[task_id]['labels'].append(label_id)
+    return [tasks[pk] for pk in task_ids if pk in tasks]
+
+
+def task_matches(task, params, user_id):
+    """Whether ``task`` passes the task list filters in ``params``, apart
+    from the full-text ``q`` which needs the database."""
+    for param in ('status', 'executor'):
+        value = params.get(param)
+        if value and str(task[param]) != value:
+            return False
+    label = params.get('label')
+    if label and label not in {str(pk) for pk in task['labels']}:
+        return False
+    if params.get('my_tasks') and task['creator'] != user_id:
+        return False
+    return True
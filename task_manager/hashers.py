@@ -0,0 +1,36 @@
+"""Password hashers whose cost comes from the settings.
+
+Each hasher keeps the algorithm name of the Django hasher it extends, so
+stored hashes stay valid. When the configured cost changes (or the
+preferred hasher in ``PASSWORD_HASHERS`` does) ``must_update`` reports
+the old hashes and Django rehashes the password on the user's next
+successful login.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return (settings.PASSWORD_PBKDF2_ITERATIONS
+                or super().iterations)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST or super().time_cost
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST or super().memory_cost
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS or super().rounds
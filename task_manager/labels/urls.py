@@ -1,9 +1,13 @@
 from django.urls import path
+from task_manager.mixins import read_view
 from . import views
 
 urlpatterns = [
     path('',
-         views.LabelListView.as_view(), name='label_list'),
+         read_view(views.LabelListView, views.LabelListAsyncView),
+         name='label_list'),
+    path('async/',
+         views.LabelListAsyncView.as_view(), name='label_list_async'),
     path('create/',
          views.LabelCreateView.as_view(), name='label_create'),
     path('<int:pk>/update/',
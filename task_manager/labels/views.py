@@ -3,16 +3,25 @@ from django.urls import reverse_lazy
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
 from django.shortcuts import redirect
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.mixins import (ConditionalGetMixin,
+                                 CustomLoginRequiredMixin, ReplicaReadMixin)
+from task_manager.pagination import (AsyncKeysetListMixin,
+                                     KeysetPaginationMixin)
 from django.utils.translation import gettext_lazy as _
 from .models import Label
 from .forms import LabelForm
 
 
-class LabelListView(CustomLoginRequiredMixin, ListView):
+class LabelListView(CustomLoginRequiredMixin, ConditionalGetMixin,
+                    ReplicaReadMixin, KeysetPaginationMixin, ListView):
     model = Label
     template_name = 'labels/labels.html'
     context_object_name = 'labels'
+    etag_versions = ('labels', 'tasks')
+
+
+class LabelListAsyncView(AsyncKeysetListMixin, LabelListView):
+    pass
 
 
 class LabelCreateView(
@@ -67,7 +76,7 @@ class LabelDeleteView(CustomLoginRequiredMixin, DeleteView):
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         success_url = self.get_success_url()
-        if self.object.tasks.exists():
+        if self.object.task_count:
             messages.error(request,
                            _('Cannot delete label because it is in use'))
             return redirect('label_list')
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import platform
+import statistics
+import time
+from io import StringIO
+from pathlib import Path
+
+import django
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import (CaptureQueriesContext,
+                               setup_test_environment,
+                               teardown_test_environment)
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+SEED_PREFIX = 'bench'
+SEED_PASSWORD = 'password'
+# Read paths served by both a sync and an async view (``<name>_async``).
+ASYNC_ENDPOINTS = ('task_list', 'task_detail', 'status_list', 'label_list',
+                   'user_list')
+
+
+def summarize(samples):
+    """Reduce per-request samples to the numbers stored in the report."""
+    timings = sorted(sample['ms'] for sample in samples)
+    if len(timings) > 1:
+        percentiles = statistics.quantiles(timings, n=100,
+                                           method='inclusive')
+        p50, p95 = percentiles[49], percentiles[94]
+    else:
+        p50 = p95 = timings[0]
+    return {
+        'requests': len(samples),
+        'p50_ms': round(p50, 3),
+        'p95_ms': round(p95, 3),
+        'queries': max(sample['queries'] for sample in samples),
+        'bytes': round(statistics.mean(sample['bytes']
+                                       for sample in samples)),
+    }
+
+
+def find_regressions(results, baseline, threshold):
+    """Compare two reports and describe every slower or chattier
+    endpoint."""
+    regressions = []
+    for scale, endpoints in results.items():
+        for name, current in endpoints.items():
+            previous = baseline.get(scale, {}).get(name)
+            if previous is None:
+                continue
+            if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+                regressions.append(
+                    f"{scale}/{name}: p95 {previous['p95_ms']}ms -> "
+                    f"{current['p95_ms']}ms")
+            if current['queries'] > previous['queries']:
+                regressions.append(
+                    f"{scale}/{name}: queries {previous['queries']} -> "
+                    f"{current['queries']}")
+    return regressions
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the hot request paths on seeded throwaway test '
+            'databases and optionally compare with a stored baseline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='100,1000,10000',
+                            help='Comma-separated numbers of tasks.')
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--output',
+                            help='Write the JSON report to this file.')
+        parser.add_argument('--baseline',
+                            help='JSON report to compare against.')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed relative p95 slowdown.')
+        parser.add_argument('--no-fail', action='store_true',
+                            help='Report regressions without failing.')
+        parser.add_argument('--concurrency', type=int, default=0,
+                            help='Also compare the sync and async read '
+                                 'views with this many concurrent '
+                                 'requests per iteration.')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options['scales'].split(',')]
+        except ValueError:
+            raise CommandError('--scales must be comma-separated integers')
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be positive')
+        self.iterations = options['iterations']
+        if options['concurrency'] < 0:
+            raise CommandError('--concurrency must not be negative')
+        self.concurrency = options['concurrency']
+
+        results = {}
+        setup_test_environment()
+        try:
+            for scale in scales:
+                results[str(scale)] = self.run_scale(scale)
+        finally:
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'iterations': self.iterations,
+                'concurrency': self.concurrency,
+                'async_views': settings.ASYNC_VIEWS,
+            },
+            'results': results,
+        }
+        self.print_report(results)
+        if options['output']:
+            path = Path(options['output'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2) + '\n')
+            self.stdout.write(f'Report written to {path}')
+        if options['baseline']:
+            self.compare(results, options)
+
+    def run_scale(self, scale):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f'Seeding {scale} tasks...')
+            call_command('seed_load', tasks=scale,
+                         users=max(10, scale // 50),
+                         prefix=SEED_PREFIX, password=SEED_PASSWORD,
+                         stdout=StringIO())
+            results = {name: summarize(self.measure(request))
+                       for name, request in self.endpoints()}
+            if self.concurrency:
+                results.update(self.measure_concurrent())
+            return results
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def endpoints(self):
+        user = User.objects.get(username=f'{SEED_PREFIX}_user_0')
+        status = Status.objects.order_by('id').first()
+        label = Label.objects.order_by('id').first()
+        task = Task.objects.order_by('id').first()
+        client = Client()
+        client.force_login(user)
+        task_list = reverse('task_list')
+        filters = {
+            'status': {'status': status.id},
+            'executor': {'executor': user.id},
+            'label': {'label': label.id} if label else {},
+            'my_tasks': {'my_tasks': 1},
+        }
+        filters['all_filters'] = {key: value for params in filters.values()
+                                  for key, value in params.items()}
+
+        yield 'task_list', lambda i: client.get(task_list)
+        for name, params in filters.items():
+            yield (f'task_list_{name}',
+                   lambda i, params=params: client.get(task_list, params))
+        yield 'task_detail', lambda i: client.get(
+            reverse('task_detail', kwargs={'pk': task.pk}))
+        yield 'task_create', lambda i: client.post(reverse('task_create'), {
+            'name': f'Benchmark task {time.time_ns()}',
+            'status': status.id,
+        })
+        yield 'user_list', lambda i: client.get(reverse('user_list'))
+        yield 'login', lambda i: Client().post(reverse('login'), {
+            'username': user.username,
+            'password': SEED_PASSWORD,
+        })
+
+    def measure(self, request):
+        request(-1)  # warm up caches and connections
+        samples = []
+        for i in range(self.iterations):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request(i)
+                elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                raise CommandError(
+                    f'{response.request["PATH_INFO"]} returned '
+                    f'{response.status_code}')
+            samples.append({
+                'ms': elapsed * 1000,
+                'queries': len(queries),
+                'bytes': len(response.content),
+            })
+        return samples
+
+    def measure_concurrent(self):
+        """Fire ``concurrency`` simultaneous requests per iteration at the
+        sync and the async variant of every read path through the ASGI
+        handler."""
+        user = User.objects.get(username=f'{SEED_PREFIX}_user_0')
+        task = Task.objects.order_by('id').first()
+
+        async def run(path):
+            client = AsyncClient()
+            await client.aforce_login(user)
+            await client.get(path)  # warm up
+
+            async def request():
+                started = time.perf_counter()
+                response = await client.get(path)
+                elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    raise CommandError(
+                        f'{path} returned {response.status_code}')
+                return {'ms': elapsed * 1000, 'queries': 0,
+                        'bytes': len(response.content)}
+
+            samples = []
+            started = time.perf_counter()
+            for _ in range(self.iterations):
+                samples += await asyncio.gather(
+                    *(request() for _ in range(self.concurrency)))
+            return samples, time.perf_counter() - started
+
+        results = {}
+        for name in ASYNC_ENDPOINTS:
+            kwargs = {'pk': task.pk} if name == 'task_detail' else {}
+            for variant, url_name in (('sync', name),
+                                      ('async', f'{name}_async')):
+                samples, elapsed = async_to_sync(run)(
+                    reverse(url_name, kwargs=kwargs))
+                summary = summarize(samples)
+                summary['rps'] = round(len(samples) / elapsed, 1)
+                results[f'{name}_c{self.concurrency}_{variant}'] = summary
+        return results
+
+    def print_report(self, results):
+        for scale, endpoints in results.items():
+            self.stdout.write(f'\n{scale} tasks')
+            self.stdout.write(f"{'endpoint':<30}{'p50 ms':>10}{'p95 ms':>10}"
+                              f"{'queries':>9}{'bytes':>10}{'req/s':>9}")
+            for name, row in endpoints.items():
+                rps = f"{row['rps']:>9.1f}" if 'rps' in row else ''
+                self.stdout.write(
+                    f"{name:<30}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+                    f"{row['queries']:>9}{row['bytes']:>10}{rps}")
+
+    def compare(self, results, options):
+        path = Path(options['baseline'])
+        if not path.exists():
+            self.stdout.write(f'No baseline at {path}, skipping comparison')
+            return
+        baseline = json.loads(path.read_text())['results']
+        regressions = find_regressions(results, baseline,
+                                       options['threshold'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions'))
+            return
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(regression))
+        if not options['no_fail']:
+            raise CommandError(f'{len(regressions)} regressions found')
@@ -0,0 +1,37 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = ('Delete expired database sessions in batches so the session '
+            'table is never locked by one huge DELETE.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0,
+                            help='Seconds to pause between batches.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now)
+        total = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)
+                        [:batch_size])
+            if not keys:
+                break
+            deleted, __ = Session.objects.filter(
+                session_key__in=keys).delete()
+            total += deleted
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Deleted {deleted} sessions')
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {total} expired sessions'))
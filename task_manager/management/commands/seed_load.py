@@ -0,0 +1,140 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import bulk_create_tasks
+from task_manager.tasks.models import Task
+from task_manager.users.models import UserTaskStats
+from task_manager.versions import bump_versions
+
+FIRST_NAMES = ['Ada', 'Alan', 'Barbara', 'Dennis', 'Edsger', 'Grace',
+               'Guido', 'Ken', 'Linus', 'Margaret', 'Niklaus', 'Radia']
+LAST_NAMES = ['Hopper', 'Knuth', 'Liskov', 'Lovelace', 'Ritchie',
+              'Thompson', 'Torvalds', 'Turing', 'Wirth']
+STATUS_NAMES = ['New', 'In progress', 'Review', 'Testing', 'Done']
+WORDS = ['fix', 'add', 'remove', 'refactor', 'update', 'login', 'form',
+         'page', 'report', 'export', 'cache', 'query', 'button', 'layout',
+         'error', 'test', 'docs', 'settings', 'profile', 'search']
+
+
+class Command(BaseCommand):
+    help = ('Fill the database with synthetic users, statuses, labels and '
+            'tasks for load testing. The same --seed always produces the '
+            'same data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--statuses', type=int, default=5)
+        parser.add_argument('--labels', type=int, default=30)
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--max-labels', type=int, default=4,
+                            help='Maximum number of labels per task.')
+        parser.add_argument('--unassigned', type=float, default=0.2,
+                            help='Share of tasks without executor.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='load',
+                            help='Prefix of generated names, must be '
+                                 'unused.')
+        parser.add_argument('--password', default='password',
+                            help='Password of every generated user.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['statuses'] < 1:
+            raise CommandError('At least one user and status are needed')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        self.prefix = options['prefix']
+        if (User.objects.filter(username__startswith=f'{self.prefix}_')
+                .exists()):
+            raise CommandError(f'Data with prefix "{self.prefix}" already '
+                               f'exists, use another --prefix')
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        started = time.monotonic()
+
+        user_ids = self.create_users(options['users'], options['password'])
+        status_ids = self.create_statuses(options['statuses'])
+        label_ids = self.create_labels(options['labels'])
+        # bulk_create sends no signals.
+        bump_versions('users', 'statuses', 'labels')
+        self.create_tasks(options['tasks'], user_ids, status_ids, label_ids,
+                          options['max_labels'], options['unassigned'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {options['users']} users, {options['statuses']} "
+            f"statuses, {options['labels']} labels and {options['tasks']} "
+            f"tasks in {time.monotonic() - started:.1f}s"))
+
+    def create_users(self, count, password):
+        # Hashing is deliberately slow, so every user shares one hash.
+        password_hash = make_password(password)
+        users = [
+            User(username=f'{self.prefix}_user_{i}',
+                 first_name=self.rng.choice(FIRST_NAMES),
+                 last_name=self.rng.choice(LAST_NAMES),
+                 password=password_hash)
+            for i in range(count)
+        ]
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+        user_ids = list(User.objects.filter(
+            username__startswith=f'{self.prefix}_user_'
+        ).order_by('id').values_list('id', flat=True))
+        UserTaskStats.objects.bulk_create(
+            [UserTaskStats(user_id=user_id) for user_id in user_ids],
+            batch_size=self.batch_size)
+        return user_ids
+
+    def create_statuses(self, count):
+        Status.objects.bulk_create([
+            Status(name=f'{self.prefix} {STATUS_NAMES[i % len(STATUS_NAMES)]}'
+                        f' {i}')
+            for i in range(count)
+        ])
+        return list(Status.objects.filter(
+            name__startswith=f'{self.prefix} '
+        ).order_by('id').values_list('id', flat=True))
+
+    def create_labels(self, count):
+        Label.objects.bulk_create([
+            Label(name=f'{self.prefix} {self.rng.choice(WORDS)} {i}')
+            for i in range(count)
+        ])
+        return list(Label.objects.filter(
+            name__startswith=f'{self.prefix} '
+        ).order_by('id').values_list('id', flat=True))
+
+    def create_tasks(self, count, user_ids, status_ids, label_ids,
+                     max_labels, unassigned):
+        # A few labels are used by most tasks, like in real trackers.
+        label_weights = [1 / (rank + 1) for rank in range(len(label_ids))]
+        max_labels = min(max_labels, len(label_ids))
+        for start in range(0, count, self.batch_size):
+            tasks, task_label_ids = [], []
+            for i in range(start, min(start + self.batch_size, count)):
+                tasks.append(Task(
+                    name=f'{self.prefix} task {i:07d}',
+                    description=' '.join(self.rng.choices(WORDS, k=12)),
+                    status_id=self.rng.choice(status_ids),
+                    creator_id=self.rng.choice(user_ids),
+                    executor_id=(None if self.rng.random() < unassigned
+                                 else self.rng.choice(user_ids)),
+                ))
+                task_label_ids.append(self.pick_labels(
+                    label_ids, label_weights, max_labels))
+            bulk_create_tasks(tasks, task_label_ids,
+                              batch_size=self.batch_size)
+            if self.verbosity > 1:
+                self.stdout.write(f'{start + len(tasks)}/{count} tasks')
+
+    def pick_labels(self, label_ids, weights, max_labels):
+        if not max_labels:
+            return []
+        count = self.rng.randint(0, max_labels)
+        return set(self.rng.choices(label_ids, weights=weights, k=count))
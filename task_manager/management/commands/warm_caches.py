@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.choices import LOADERS, get_choices
+
+
+class Command(BaseCommand):
+    help = ('Load the cached lookup choices so the first requests after '
+            'a deploy or worker start find them.')
+
+    def handle(self, *args, **options):
+        for name in LOADERS:
+            choices = get_choices(name)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Cached {len(choices)} {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Warmed {len(LOADERS)} choice lists'))
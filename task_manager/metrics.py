@@ -0,0 +1,97 @@
+"""Application counters exposed in the Prometheus text format.
+
+Counters live in the ``METRICS_CACHE`` cache so that every worker
+process adds to the same values; with a per-process cache (locmem) each
+scrape only sees the process that answered it. Counter values may be
+lost when the cache evicts or restarts, which Prometheus treats as a
+counter reset.
+
+Collectors registered with ``register_collector`` add samples read at
+scrape time, such as the state of this process' connection pools.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+REGISTRY = []
+COLLECTORS = []
+
+
+class Counter:
+    """Monotonic counter, optionally split by one label whose values are
+    declared up front so that a scrape can read them all at once."""
+
+    def __init__(self, name, documentation, label=None, values=()):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.values = tuple(values)
+        REGISTRY.append(self)
+
+    def _key(self, value=None):
+        if value is None:
+            return f'metrics:{self.name}'
+        return f'metrics:{self.name}:{value}'
+
+    def samples(self):
+        if self.label is None:
+            return [('', self._key())]
+        return [(f'{{{self.label}="{value}"}}', self._key(value))
+                for value in self.values]
+
+    def inc(self, value=None):
+        if (value is None) != (self.label is None) or (
+                value is not None and value not in self.values):
+            raise ValueError(f'Unexpected label value for {self.name}: '
+                             f'{value!r}')
+        cache = caches[settings.METRICS_CACHE]
+        key = self._key(value)
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add and incr.
+            cache.add(key, 1, None)
+
+
+LOGIN_ATTEMPTS = Counter(
+    'login_attempts_total', 'Login form submissions.')
+LOGIN_THROTTLED = Counter(
+    'login_throttled_total',
+    'Login attempts rejected by the rate limiter before authentication.',
+    label='scope', values=('username', 'ip'))
+LOGIN_FAILURES = Counter(
+    'login_failures_total', 'Login attempts with wrong credentials.')
+
+
+def register_collector(collector):
+    """Add ``collector()`` to every scrape. It returns a list of
+    ``(name, type, documentation, [(labels, value), ...])``, the labels
+    being a dict."""
+    COLLECTORS.append(collector)
+    return collector
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in labels.items())
+    return f'{{{pairs}}}'
+
+
+def render_metrics():
+    """All counters and collected samples in the Prometheus text format."""
+    keys = [key for counter in REGISTRY for __, key in counter.samples()]
+    values = caches[settings.METRICS_CACHE].get_many(keys)
+    lines = []
+    for counter in REGISTRY:
+        lines.append(f'# HELP {counter.name} {counter.documentation}')
+        lines.append(f'# TYPE {counter.name} counter')
+        for labels, key in counter.samples():
+            lines.append(f'{counter.name}{labels} {values.get(key, 0)}')
+    for collector in COLLECTORS:
+        for name, kind, documentation, samples in collector():
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
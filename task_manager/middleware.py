@@ -0,0 +1,101 @@
+"""Request instrumentation and replica pinning middleware."""
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger('task_manager.timing')
+
+
+class QueryTimer:
+    """``execute_wrapper`` counting queries and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class RequestTimingMiddleware:
+    """Measure DB, template and view time of every request.
+
+    The numbers are sent back in a ``Server-Timing`` header and logged to
+    the ``task_manager.timing`` logger; requests running more queries than
+    ``REQUEST_TIMING_QUERY_THRESHOLD`` are logged as warnings. Template
+    time covers ``TemplateResponse`` rendering, views calling ``render()``
+    directly count it as view time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_threshold = settings.REQUEST_TIMING_QUERY_THRESHOLD
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request.template_render_time = 0.0
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        render = request.template_render_time
+        view = max(total - timer.duration - render, 0.0)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"',
+            f'tpl;dur={render * 1000:.1f}',
+            f'view;dur={view * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        message = (f'method={request.method} path={request.path} '
+                   f'status={response.status_code} '
+                   f'queries={timer.count} db_ms={timer.duration * 1000:.1f} '
+                   f'tpl_ms={render * 1000:.1f} view_ms={view * 1000:.1f} '
+                   f'total_ms={total * 1000:.1f}')
+        if timer.count > self.query_threshold:
+            logger.warning(f'{message} query_threshold_exceeded=true')
+        else:
+            logger.info(message)
+        return response
+
+    def process_template_response(self, request, response):
+        # TemplateResponses are rendered right after the template
+        # response middleware chain has run.
+        started = time.perf_counter()
+
+        def finished(rendered_response):
+            request.template_render_time += time.perf_counter() - started
+
+        response.add_post_render_callback(finished)
+        return response
+
+
+class ReplicaPinMiddleware(MiddlewareMixin):
+    """Pin a client that sent a write to the primary database for
+    ``REPLICA_PIN_SECONDS``, so that the page it is redirected to shows
+    the change even if the replica lags behind.
+
+    ``MiddlewareMixin`` makes it both sync and async capable, so it
+    doesn't move ASGI requests to a thread.
+    """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def process_response(self, request, response):
+        if (settings.READ_REPLICA
+                and request.method not in self.safe_methods):
+            response.set_cookie(settings.REPLICA_PIN_COOKIE, '1',
+                                max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    table_version = apps.get_model('task_manager', 'TableVersion')
+    table_version.objects.bulk_create(
+        [table_version(name=name)
+         for name in ('tasks', 'statuses', 'labels', 'users')],
+        ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
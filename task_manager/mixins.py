@@ -1,7 +1,19 @@
+import hashlib
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.utils.translation import gettext_lazy as _
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                quote_etag)
+from django.utils.translation import get_language, gettext_lazy as _
+
+from task_manager.routers import replica_reads, uses_replica
+from task_manager.versions import get_versions
 
 
 class CustomLoginRequiredMixin(LoginRequiredMixin):
@@ -26,3 +38,135 @@ class UserOwnershipRequiredMixin(UserPassesTestMixin):
             pass
         messages.error(self.request, self.permission_denied_message)
         return redirect('user_list')
+
+
+class ConditionalGetMixin:
+    """Answer a GET with 304 Not Modified, before the page's queries run,
+    when the page would render the same as the copy the client holds.
+
+    The ETag covers the version stamps of ``etag_versions`` (every table
+    the page reads), ``get_etag_parts()``, the URL with its filters, the
+    user, the language, the CSRF cookie (pages embed tokens derived
+    from it) and the deployed code version. Pages with pending flash messages are always rendered so
+    that the messages are shown.
+
+    Pages read from the replica get neither ETag nor 304: the stamps
+    follow the primary, so a lagging replica would pair a new stamp
+    with old rows and the client would keep them until the next write.
+    """
+    etag_versions = ()
+
+    def uses_conditional_get(self):
+        return not (isinstance(self, ReplicaReadMixin)
+                    and uses_replica(self.request))
+
+    def get_etag_parts(self):
+        return ()
+
+    def get_versions(self, *names):
+        """Stamps of ``names``, reusing the ones read for the ETag."""
+        versions = getattr(self, '_versions', {})
+        if not versions.keys() >= set(names):
+            versions = get_versions(*names)
+        return {name: versions[name] for name in names}
+
+    def get_etag(self):
+        request = self.request
+        # Makes sure the CSRF secret exists, so the first response
+        # already carries the ETag of the following requests.
+        get_token(request)
+        self._versions = get_versions(*self.etag_versions)
+        key = repr((
+            self.get_etag_parts(),
+            sorted(self._versions.items()),
+            request.get_full_path(), request.user.pk, get_language(),
+            request.META['CSRF_COOKIE'], settings.CODE_VERSION,
+        ))
+        return quote_etag(hashlib.md5(key.encode(),
+                                      usedforsecurity=False).hexdigest())
+
+    def conditional_response(self):
+        """Return ``(etag, response)``, the response being a 304 when
+        the client's copy is current and ``None`` otherwise."""
+        etag = self.get_etag()
+        if len(messages.get_messages(self.request)):
+            return etag, None
+        return etag, get_conditional_response(self.request, etag=etag)
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or not self.uses_conditional_get()):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self._adispatch(request, *args, **kwargs)
+        etag, response = self.conditional_response()
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        return self.patch_conditional_response(response, etag)
+
+    async def _adispatch(self, request, *args, **kwargs):
+        # The cache and the session may be backed by the database.
+        etag, response = await sync_to_async(
+            self.conditional_response)()
+        if response is None:
+            response = await super().dispatch(request, *args, **kwargs)
+        return self.patch_conditional_response(response, etag)
+
+    def patch_conditional_response(self, response, etag):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ReplicaReadMixin:
+    """Read the page's data from the read replica, if one is configured.
+
+    List it after the permission and conditional GET mixins: their
+    checks read the user and the session from the primary before the
+    replica is switched on.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch_replica(request, *args, **kwargs)
+        with replica_reads(request):
+            return super().dispatch(request, *args, **kwargs)
+
+    async def _adispatch_replica(self, request, *args, **kwargs):
+        with replica_reads(request):
+            return await super().dispatch(request, *args, **kwargs)
+
+
+def read_view(sync_view, async_view):
+    """View for a read path: ``async_view`` when ``ASYNC_VIEWS`` is on."""
+    return (async_view if settings.ASYNC_VIEWS else sync_view).as_view()
+
+
+class AsyncViewMixin:
+    """Serve a generic view through an async ``get``.
+
+    The user is resolved without blocking and stored on the request, so
+    the synchronous permission checks of the sync base view and the
+    templates reuse it instead of querying from the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        response = super().dispatch(request, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+
+class AsyncDetailViewMixin(AsyncViewMixin):
+    """Async ``get`` for a ``DetailView`` looked up by primary key."""
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.get_queryset().filter(
+            pk=self.kwargs[self.pk_url_kwarg]).afirst()
+        if self.object is None:
+            raise Http404
+        context = await sync_to_async(self.get_context_data)(
+            object=self.object)
+        return self.render_to_response(context)
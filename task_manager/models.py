@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """Version stamp of one table, see ``task_manager.versions``."""
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name}@{self.version}'
@@ -0,0 +1,238 @@
+"""Keyset (cursor) pagination for list views.
+
+Pages are addressed by the ordering values of the last (or first) row of
+the neighbouring page instead of an OFFSET, so deep pages cost the same
+as the first one as long as the ordering is backed by an index.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+from task_manager.mixins import AsyncViewMixin
+
+
+def encode_cursor(values):
+    """Serialize ordering values into an opaque URL-safe token."""
+    payload = [value.isoformat() if isinstance(value, (datetime.date,
+                                                       datetime.time))
+               else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Return the ordering values stored in ``cursor`` or ``None`` if the
+    token is malformed or doesn't match ``ordering``."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    result = []
+    for field_name, value in zip(_field_names(ordering), values):
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            result.append(value)
+            continue
+        try:
+            result.append(field.to_python(value))
+        except ValidationError:
+            return None
+    return result
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """Build a ``Q`` selecting rows strictly after ``values`` in
+    ``ordering`` (or strictly before them when ``reverse`` is set)."""
+    condition = Q()
+    equal = Q()
+    for field_name, descending, value in zip(
+            _field_names(ordering), _descending(ordering), values):
+        lookup = 'lt' if descending != reverse else 'gt'
+        condition |= equal & Q(**{f'{field_name}__{lookup}': value})
+        equal &= Q(**{field_name: value})
+    return condition
+
+
+def cursor_values(obj, ordering):
+    return [getattr(obj, field_name) for field_name in _field_names(ordering)]
+
+
+def reverse_ordering(ordering):
+    return [name[1:] if name.startswith('-') else f'-{name}'
+            for name in ordering]
+
+
+def build_page_queryset(queryset, ordering, page_size, params,
+                        after_kwarg='after', before_kwarg='before'):
+    """Return ``(queryset, backwards)`` fetching one row more than
+    ``page_size`` so the caller can tell whether another page exists."""
+    model = queryset.model
+    before = params.get(before_kwarg)
+    after = params.get(after_kwarg)
+    backwards = False
+    if before:
+        values = decode_cursor(before, model, ordering)
+        if values is not None:
+            queryset = queryset.filter(
+                keyset_filter(ordering, values, reverse=True))
+            backwards = True
+    elif after:
+        values = decode_cursor(after, model, ordering)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(ordering, values))
+    if backwards:
+        queryset = queryset.order_by(*reverse_ordering(ordering))
+    else:
+        queryset = queryset.order_by(*ordering)
+    return queryset[:page_size + 1], backwards
+
+
+def build_page(rows, ordering, page_size, params, backwards,
+               after_kwarg='after', before_kwarg='before'):
+    rows = list(rows)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next = has_more
+        has_previous = bool(params.get(after_kwarg)
+                            or params.get(before_kwarg))
+    return CursorPage(
+        rows,
+        next_cursor=(encode_cursor(cursor_values(rows[-1], ordering))
+                     if has_next and rows else None),
+        previous_cursor=(encode_cursor(cursor_values(rows[0], ordering))
+                         if has_previous and rows else None),
+        params=params,
+        after_kwarg=after_kwarg,
+        before_kwarg=before_kwarg,
+    )
+
+
+def paginate_keyset(queryset, ordering, page_size, params, **kwargs):
+    page_queryset, backwards = build_page_queryset(
+        queryset, ordering, page_size, params, **kwargs)
+    return build_page(page_queryset, ordering, page_size, params, backwards,
+                      **kwargs)
+
+
+async def apaginate_keyset(queryset, ordering, page_size, params, **kwargs):
+    page_queryset, backwards = build_page_queryset(
+        queryset, ordering, page_size, params, **kwargs)
+    rows = [row async for row in page_queryset]
+    return build_page(rows, ordering, page_size, params, backwards,
+                      **kwargs)
+
+
+class CursorPage:
+    """Page of results together with links to its neighbours."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, params,
+                 after_kwarg='after', before_kwarg='before'):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.params = params
+        self.after_kwarg = after_kwarg
+        self.before_kwarg = before_kwarg
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_url(self):
+        if self.next_cursor is None:
+            return None
+        return self._url(self.after_kwarg, self.next_cursor)
+
+    @property
+    def previous_url(self):
+        if self.previous_cursor is None:
+            return None
+        return self._url(self.before_kwarg, self.previous_cursor)
+
+    def _url(self, kwarg, cursor):
+        params = self.params.copy()
+        params.pop(self.after_kwarg, None)
+        params.pop(self.before_kwarg, None)
+        params[kwarg] = cursor
+        return f'?{params.urlencode()}'
+
+
+class KeysetPaginationMixin:
+    """ListView mixin replacing OFFSET pagination with cursor pagination.
+
+    ``cursor_ordering`` must end with a unique column so that every row
+    has a distinct position.
+    """
+    paginate_by = 50
+    max_paginate_by = 200
+    page_size_kwarg = 'page_size'
+    cursor_ordering = ('created_at', 'id')
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def get_paginate_by(self, queryset):
+        try:
+            page_size = int(self.request.GET.get(self.page_size_kwarg, ''))
+        except ValueError:
+            return self.paginate_by
+        return max(1, min(page_size, self.max_paginate_by))
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_keyset(queryset, self.get_cursor_ordering(),
+                               page_size, self.request.GET)
+        return None, page, page.object_list, page.has_other_pages()
+
+
+class AsyncKeysetListMixin(AsyncViewMixin):
+    """Async ``get`` for a ``ListView`` using ``KeysetPaginationMixin``.
+
+    The page is fetched with the async ORM; the context (which may read
+    cached choices) is built in the sync thread and the template is
+    rendered by the ASGI handler.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        self.page = await apaginate_keyset(
+            self.object_list, self.get_cursor_ordering(),
+            self.get_paginate_by(self.object_list), request.GET)
+        context = await sync_to_async(self.get_context_data)()
+        return self.render_to_response(context)
+
+    def paginate_queryset(self, queryset, page_size):
+        return (None, self.page, self.page.object_list,
+                self.page.has_other_pages())
+
+
+def _field_names(ordering):
+    return [name.lstrip('-') for name in ordering]
+
+
+def _descending(ordering):
+    return [name.startswith('-') for name in ordering]
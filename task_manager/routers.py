@@ -0,0 +1,70 @@
+"""Routing of page reads to the read replica.
+
+``ReplicaReadMixin`` turns replica reads on for the duration of a view's
+``get``; everything else (authentication, sessions, writes and the
+database cache and the version stamps) keeps using the primary. ``ReplicaPinMiddleware`` marks
+clients that just wrote with a short-lived cookie, and their reads stay
+on the primary until the replica has caught up with the write.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Apps whose tables must always be read from the primary.
+PRIMARY_APP_LABELS = {'sessions', 'django_cache', 'task_manager'}
+
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+
+def is_pinned(request):
+    return settings.REPLICA_PIN_COOKIE in request.COOKIES
+
+
+def uses_replica(request):
+    """Whether ``replica_reads`` sends the reads of ``request`` to the
+    replica."""
+    return bool(settings.READ_REPLICA) and not is_pinned(request)
+
+
+@contextmanager
+def replica_reads(request):
+    """Send the reads made inside the block to ``READ_REPLICA`` unless
+    it isn't configured or the client is pinned to the primary."""
+    if not uses_replica(request):
+        yield
+        return
+    token = _read_alias.set(settings.READ_REPLICA)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, e.g. to fill a cache that
+    outlives the replica's lag."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_APP_LABELS:
+            return None
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, settings.READ_REPLICA}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
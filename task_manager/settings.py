@@ -1,5 +1,6 @@
 """settings.py module for the task manager app."""
 import os
+import tempfile
 from  pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -18,9 +19,54 @@ ALLOWED_HOSTS = os.getenv(
 ROOT_URLCONF = 'task_manager.urls'
 WSGI_APPLICATION = 'task_manager.wsgi.application'
 
+# Persistent connections are checked before each request reuses them,
+# so a connection killed by a failover doesn't fail the next request.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 600))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+# PostgreSQL only: a psycopg connection pool per worker process instead of
+# one persistent connection per thread (requires `pip install .[pool]`).
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 4))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+# PostgreSQL only: milliseconds before a statement is cancelled, 0 for no
+# limit.
+DB_STATEMENT_TIMEOUT = int(os.getenv('DB_STATEMENT_TIMEOUT', 0))
+
 DATABASES = {
-    'default': dj_database_url.config(conn_max_age=600)
+    'default': dj_database_url.config(
+        conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS)
 }
+# Optional read replica for the list and detail pages.
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS)
+for DB_SETTINGS in DATABASES.values():
+    if DB_SETTINGS.get('ENGINE') != 'django.db.backends.postgresql':
+        continue
+    DB_OPTIONS = DB_SETTINGS.setdefault('OPTIONS', {})
+    if DB_STATEMENT_TIMEOUT:
+        DB_OPTIONS['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT}'
+    if DB_POOL:
+        from psycopg_pool import ConnectionPool
+
+        DB_OPTIONS['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+        if DB_CONN_HEALTH_CHECKS:
+            DB_OPTIONS['pool']['check'] = ConnectionPool.check_connection
+
+DATABASE_ROUTERS = ['task_manager.routers.ReplicaRouter']
+READ_REPLICA = 'replica' if DATABASE_REPLICA_URL else None
+# Clients that sent a write read from the primary for this many seconds.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 10))
+REPLICA_PIN_COOKIE = 'pin_primary'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -32,6 +78,7 @@ INSTALLED_APPS = [
     'task_manager.statuses.apps.StatusesConfig',
     'task_manager.labels',
     'task_manager.tasks.apps.TasksConfig',
+    'task_manager.users.apps.UsersConfig',
     'django_bootstrap5',
     'django.contrib.staticfiles',
     'django.contrib.admin',
@@ -68,10 +115,88 @@ MIDDLEWARE = [
     'rollbar.contrib.django.middleware.RollbarNotifierMiddleware',
     'django.middleware.locale.LocaleMiddleware',
 ]
+if DATABASE_REPLICA_URL:
+    MIDDLEWARE.append('task_manager.middleware.ReplicaPinMiddleware')
 
-MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
+REQUEST_TIMING = os.getenv('REQUEST_TIMING', 'False') == 'True'
+REQUEST_TIMING_QUERY_THRESHOLD = int(
+    os.getenv('REQUEST_TIMING_QUERY_THRESHOLD', 30))
+if REQUEST_TIMING:
+    MIDDLEWARE.insert(1, 'task_manager.middleware.RequestTimingMiddleware')
 
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'task_manager': {
+            'handlers': ['console'],
+            'level': os.getenv('LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
+# Deployed revision; Render sets RENDER_GIT_COMMIT.
+CODE_VERSION = os.getenv('CODE_VERSION',
+                         os.getenv('RENDER_GIT_COMMIT', '1.0'))[:12]
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_LOCATIONS = {
+    'locmem': 'task-manager',
+    'file': os.path.join(tempfile.gettempdir(), 'task_manager_cache'),
+    # Created by `python manage.py createcachetable`.
+    'db': 'cache_table',
+    'redis': os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/1'),
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND])
+# Entries of the default cache (choices, rendered fragments) are
+# prefixed with the code version so that a deploy starts from a clean
+# cache; sessions survive deploys.
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': CACHE_LOCATION,
+        'KEY_PREFIX': f'task_manager:{CODE_VERSION}',
+    },
+    'sessions': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': CACHE_LOCATION,
+        'KEY_PREFIX': 'task_manager:sessions',
+    },
+}
+SESSION_CACHE_ALIAS = 'sessions'
+
+MESSAGE_STORAGES = {
+    'cookie': 'django.contrib.messages.storage.cookie.CookieStorage',
+    'session': 'django.contrib.messages.storage.session.SessionStorage',
+    'fallback': 'django.contrib.messages.storage.fallback.FallbackStorage',
+}
+MESSAGE_STORAGE = MESSAGE_STORAGES[os.getenv('MESSAGE_STORAGE', 'cookie')]
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_BACKEND', 'db')]
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 
 LANGUAGE_CODE = 'ru'
@@ -91,10 +216,71 @@ LOCALE_PATHS = [
 
 LOGIN_URL = 'login'
 
+# The first hasher of the chosen list hashes new passwords; the others
+# only verify existing hashes, which are rehashed on the next login.
+PASSWORD_HASHER_LISTS = {
+    'pbkdf2': [
+        'task_manager.hashers.PBKDF2PasswordHasher',
+        'task_manager.hashers.Argon2PasswordHasher',
+        'task_manager.hashers.BCryptSHA256PasswordHasher',
+    ],
+    'argon2': [
+        'task_manager.hashers.Argon2PasswordHasher',
+        'task_manager.hashers.PBKDF2PasswordHasher',
+        'task_manager.hashers.BCryptSHA256PasswordHasher',
+    ],
+    'bcrypt': [
+        'task_manager.hashers.BCryptSHA256PasswordHasher',
+        'task_manager.hashers.PBKDF2PasswordHasher',
+        'task_manager.hashers.Argon2PasswordHasher',
+    ],
+}
+PASSWORD_HASHERS = PASSWORD_HASHER_LISTS[os.getenv('PASSWORD_HASHER',
+                                                   'pbkdf2')]
+# Hashing costs; 0 keeps Django's default for the hasher.
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 0))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', 0))
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.getenv('PASSWORD_ARGON2_MEMORY_COST', 0))
+PASSWORD_BCRYPT_ROUNDS = int(os.getenv('PASSWORD_BCRYPT_ROUNDS', 0))
+
+# Login attempts allowed per username and per client address within a
+# sliding window of LOGIN_THROTTLE_WINDOW seconds.
+LOGIN_THROTTLE_WINDOW = int(os.getenv('LOGIN_THROTTLE_WINDOW', 300))
+LOGIN_THROTTLE_USERNAME_LIMIT = int(
+    os.getenv('LOGIN_THROTTLE_USERNAME_LIMIT', 10))
+LOGIN_THROTTLE_IP_LIMIT = int(os.getenv('LOGIN_THROTTLE_IP_LIMIT', 50))
+# Number of trusted proxies appending to X-Forwarded-For (1 on Render).
+LOGIN_THROTTLE_PROXY_COUNT = int(os.getenv('LOGIN_THROTTLE_PROXY_COUNT', 0))
+THROTTLE_CACHE = 'default'
+
+METRICS_CACHE = 'default'
+# Bearer token for /metrics/; without it only staff users can read it.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+CHOICES_CACHE_TIMEOUT = int(os.getenv('CHOICES_CACHE_TIMEOUT', 300))
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv('FRAGMENT_CACHE_TIMEOUT', 3600))
+
+# Serve the task, status, label and user read paths with async views.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+# Open the live task feed from the task list; only enable it when the
+# project is served through task_manager.asgi.
+EVENTS_ENABLED = os.getenv('EVENTS_ENABLED', 'False') == 'True'
+EVENTS_BACKENDS = {
+    'local': 'task_manager.events.LocalBackend',
+    'redis': 'task_manager.events.RedisBackend',
+}
+EVENTS_BACKEND = EVENTS_BACKENDS[os.getenv('EVENTS_BACKEND', 'local')]
+EVENTS_REDIS_URL = os.getenv('EVENTS_REDIS_URL', 'redis://localhost:6379/0')
+EVENTS_CHANNEL = os.getenv('EVENTS_CHANNEL', 'task_manager:task_events')
+EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', 1000))
+EVENTS_KEEPALIVE = int(os.getenv('EVENTS_KEEPALIVE', 15))
+
 ROLLBAR = {
     'access_token': os.getenv('ROLLBAR_ACCESS_TOKEN', ''),
     'environment': 'development' if DEBUG else 'production',
-    'code_version': '1.0',
+    'code_version': CODE_VERSION,
     'root': BASE_DIR,
     'enabled': os.getenv('ROLLBAR_ENABLED', 'False') == 'True',
 }
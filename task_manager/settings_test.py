@@ -0,0 +1,26 @@
+"""Settings for the test suite: the production settings with a fast
+password hasher, since every test creates users and logs them in, and
+an in-process cache, since query-count tests expect cache hits to cost
+no queries.
+
+A second SQLite database stands in for the read replica. Reads are only
+routed to it by tests that enable ``READ_REPLICA`` and declare both
+databases.
+"""
+from task_manager.settings import *  # noqa: F401,F403
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+CACHES = {
+    alias: dict(options, BACKEND=CACHE_BACKENDS['locmem'],  # noqa: F405
+                LOCATION=CACHE_LOCATIONS['locmem'])  # noqa: F405
+    for alias, options in CACHES.items()  # noqa: F405
+}
+
+DATABASES['replica'] = {  # noqa: F405
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': BASE_DIR / 'replica.sqlite3',  # noqa: F405
+}
+READ_REPLICA = None
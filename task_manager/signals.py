@@ -0,0 +1,67 @@
+"""Signal handlers keeping the version stamps, and with them the cached
+choices and fragments, and the live task feed in sync with the models."""
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from task_manager.events import (CREATED, DELETED, UPDATED,
+                                 publish_task_changes)
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskLabel
+from task_manager.versions import bump_versions
+
+
+def _only_last_login(update_fields):
+    return update_fields is not None and set(update_fields) == {'last_login'}
+
+
+@receiver([post_save, post_delete], sender=Status)
+def bump_status_version(sender, **kwargs):
+    bump_versions('statuses')
+
+
+@receiver([post_save, post_delete], sender=Label)
+def bump_label_version(sender, signal, **kwargs):
+    if signal is post_delete:
+        # The cascade drops task links without sending m2m signals.
+        bump_versions('labels', 'tasks')
+    else:
+        bump_versions('labels')
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_user_version(sender, update_fields=None, **kwargs):
+    # Every login saves last_login, which no page shows.
+    if _only_last_login(update_fields):
+        return
+    bump_versions('users')
+
+
+@receiver([post_save, post_delete], sender=Task)
+def bump_task_version(sender, raw=False, **kwargs):
+    if not raw:
+        bump_versions('tasks')
+
+
+@receiver(post_save, sender=Task)
+def publish_saved_task(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        publish_task_changes(CREATED if created else UPDATED, [instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def publish_deleted_task(sender, instance, **kwargs):
+    publish_task_changes(DELETED, [instance.pk])
+
+
+@receiver(m2m_changed, sender=TaskLabel)
+def bump_task_label_version(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if not action.startswith('post_'):
+        return
+    bump_versions('tasks')
+    if not reverse:
+        publish_task_changes(UPDATED, [instance.pk])
+    elif pk_set:
+        publish_task_changes(UPDATED, pk_set)
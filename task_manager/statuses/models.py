@@ -4,6 +4,7 @@ from django.db import models
 class Status(models.Model):
     name = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    task_count = models.IntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
@@ -1,10 +1,14 @@
 from django.urls import path
+from task_manager.mixins import read_view
 from . import views
 
 
 urlpatterns = [
     path('',
-         views.StatusListView.as_view(), name='status_list'),
+         read_view(views.StatusListView, views.StatusListAsyncView),
+         name='status_list'),
+    path('async/',
+         views.StatusListAsyncView.as_view(), name='status_list_async'),
     path('create/',
          views.StatusCreateView.as_view(), name='status_create'),
     path('<int:pk>/update/',
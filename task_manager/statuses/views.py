@@ -3,17 +3,26 @@ from django.urls import reverse_lazy
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
 from django.shortcuts import redirect
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.mixins import (ConditionalGetMixin,
+                                 CustomLoginRequiredMixin, ReplicaReadMixin)
+from task_manager.pagination import (AsyncKeysetListMixin,
+                                     KeysetPaginationMixin)
 from django.db.models import ProtectedError
 from django.utils.translation import gettext_lazy as _
 from .models import Status
 from .forms import StatusForm
 
 
-class StatusListView(CustomLoginRequiredMixin, ListView):
+class StatusListView(CustomLoginRequiredMixin, ConditionalGetMixin,
+                     ReplicaReadMixin, KeysetPaginationMixin, ListView):
     model = Status
     template_name = 'statuses/statuses.html'
     context_object_name = 'statuses'
+    etag_versions = ('statuses', 'tasks')
+
+
+class StatusListAsyncView(AsyncKeysetListMixin, StatusListView):
+    pass
 
 
 class StatusCreateView(CustomLoginRequiredMixin,
@@ -61,6 +70,10 @@ class StatusDeleteView(CustomLoginRequiredMixin, DeleteView):
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         success_url = self.get_success_url()
+        if self.object.task_count:
+            messages.error(self.request,
+                           _('Cannot delete status because it is in use'))
+            return redirect('status_list')
         try:
             self.object.delete()
             messages.success(self.request,
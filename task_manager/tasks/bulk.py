@@ -0,0 +1,165 @@
+"""Set-based task writes used by the import and seeding commands and by
+the bulk actions of the task list."""
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager.events import DELETED, UPDATED, publish_task_changes
+from task_manager.versions import bump_versions
+
+from .counters import count_labels, count_tasks, counted_relations
+from .models import Task, TaskLabel
+from .stats import count_task_stats, task_day
+
+
+def bulk_create_tasks(tasks, label_ids, batch_size=None):
+    """Insert ``tasks`` together with their label links.
+
+    ``label_ids[i]`` holds the label ids of ``tasks[i]``. Both the tasks
+    and the through rows are written with ``bulk_create`` in one
+    transaction; the counters are moved with one update per affected
+    row and the statistics tables with one update per affected summary
+    row, since ``bulk_create`` sends no signals. Imported tasks are not
+    announced on the live feed.
+    """
+    with transaction.atomic():
+        created = Task.objects.bulk_create(tasks, batch_size=batch_size)
+        if any(task.pk is None for task in created):
+            # Backends without INSERT ... RETURNING don't set the ids.
+            ids = dict(Task.objects.filter(
+                name__in=[task.name for task in created]
+            ).values_list('name', 'id'))
+            for task in created:
+                task.pk = ids[task.name]
+        links = [TaskLabel(task_id=task.pk, label_id=label_id)
+                 for task, task_label_ids in zip(created, label_ids)
+                 for label_id in set(task_label_ids)]
+        TaskLabel.objects.bulk_create(links, batch_size=batch_size)
+        count_tasks(counted_relations(task) for task in created)
+        count_labels(link.label_id for link in links)
+        count_task_stats((task.status_id, task.executor_id, task_day(task))
+                         for task in created)
+        bump_versions('tasks')
+    return created
+
+
+BULK_CHUNK_SIZE = 500
+
+
+def _chunks(ids, size=BULK_CHUNK_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _locked_rows(queryset):
+    """Lock the selected tasks and return ``(id, status_id, creator_id,
+    executor_id, created_at)`` of each."""
+    return list(queryset.order_by('pk').select_for_update(of=('self',))
+                .values_list('pk', *Task.COUNTED_FIELDS, 'created_at'))
+
+
+def _stats_rows(rows):
+    return [(status_id, executor_id, timezone.localdate(created_at))
+            for _, status_id, _, executor_id, created_at in rows]
+
+
+def bulk_update_tasks(queryset, **values):
+    """Set ``status_id`` and/or ``executor_id`` on every task of
+    ``queryset`` with one UPDATE per chunk of ids and return the number
+    of tasks."""
+    with transaction.atomic():
+        rows = _locked_rows(queryset)
+        ids = [row[0] for row in rows]
+        for chunk in _chunks(ids):
+            Task.objects.filter(pk__in=chunk).touch(**values)
+        previous, updated = [], []
+        for row in rows:
+            pk, status_id, creator_id, executor_id, created_at = row
+            new_row = (pk, values.get('status_id', status_id), creator_id,
+                       values.get('executor_id', executor_id), created_at)
+            if new_row != row:
+                previous.append(row)
+                updated.append(new_row)
+        count_tasks((row[1:4] for row in previous), sign=-1)
+        count_tasks(row[1:4] for row in updated)
+        count_task_stats(_stats_rows(previous), sign=-1)
+        count_task_stats(_stats_rows(updated))
+        bump_versions('tasks')
+        publish_task_changes(UPDATED, [row[0] for row in updated])
+    return len(ids)
+
+
+def bulk_add_labels(queryset, label_ids):
+    """Link every task of ``queryset`` to ``label_ids``, inserting only
+    the missing through rows, and return the number of tasks."""
+    label_ids = set(label_ids)
+    with transaction.atomic():
+        ids = [row[0] for row in _locked_rows(queryset)]
+        links = []
+        for chunk in _chunks(ids):
+            existing = set(TaskLabel.objects.filter(
+                task_id__in=chunk, label_id__in=label_ids
+            ).values_list('task_id', 'label_id'))
+            links += [TaskLabel(task_id=task_id, label_id=label_id)
+                      for task_id in chunk for label_id in label_ids
+                      if (task_id, label_id) not in existing]
+        TaskLabel.objects.bulk_create(links, batch_size=BULK_CHUNK_SIZE)
+        changed_ids = sorted({link.task_id for link in links})
+        for chunk in _chunks(changed_ids):
+            Task.objects.filter(pk__in=chunk).touch()
+        count_labels(link.label_id for link in links)
+        bump_versions('tasks')
+        publish_task_changes(UPDATED, changed_ids)
+    return len(ids)
+
+
+def bulk_remove_labels(queryset, label_ids):
+    """Unlink ``label_ids`` from every task of ``queryset`` with one
+    DELETE per chunk of ids and return the number of tasks."""
+    with transaction.atomic():
+        ids = [row[0] for row in _locked_rows(queryset)]
+        removed = []
+        for chunk in _chunks(ids):
+            links = TaskLabel.objects.filter(task_id__in=chunk,
+                                             label_id__in=label_ids)
+            removed += links.values_list('task_id', 'label_id')
+            links.delete()
+        changed_ids = sorted({task_id for task_id, _ in removed})
+        for chunk in _chunks(changed_ids):
+            Task.objects.filter(pk__in=chunk).touch()
+        count_labels((label_id for _, label_id in removed), sign=-1)
+        bump_versions('tasks')
+        publish_task_changes(UPDATED, changed_ids)
+    return len(ids)
+
+
+def bulk_delete_tasks(queryset):
+    """Delete every task of ``queryset`` in one transaction and return the
+    number of deleted tasks.
+
+    Rows are removed with plain DELETE statements instead of the per-object
+    collector, so the counters, statistics and label links are updated
+    here rather than by the delete signal handlers.
+    """
+    with transaction.atomic():
+        rows = _locked_rows(queryset)
+        ids = [row[0] for row in rows]
+        label_ids = []
+        for chunk in _chunks(ids):
+            links = TaskLabel.objects.filter(task_id__in=chunk)
+            label_ids += links.values_list('label_id', flat=True)
+            # Links have no delete signals, so this is a single DELETE.
+            links.delete()
+            # QuerySet.delete() would load every task and send the
+            # per-object signals, whose handlers move the counters and
+            # statistics one task at a time on top of the set-based
+            # updates below. _raw_delete is the collector-free DELETE
+            # it runs internally; test_task_bulk_delete_skips_signals
+            # pins the behaviour across Django upgrades.
+            tasks = Task.objects.filter(pk__in=chunk)
+            tasks._raw_delete(tasks.db)
+        count_tasks((row[1:4] for row in rows), sign=-1)
+        count_labels(label_ids, sign=-1)
+        count_task_stats(_stats_rows(rows), sign=-1)
+        bump_versions('tasks')
+        publish_task_changes(DELETED, ids)
+    return len(ids)
@@ -0,0 +1,104 @@
+"""Denormalized task counters on statuses, labels and users.
+
+``Status.task_count``, ``Label.task_count`` and ``UserTaskStats`` are kept
+up to date with F-expression updates by the handlers in ``signals.py``
+and by the bulk helpers; ``recount_task_counters`` rebuilds all of them
+from the tasks when they drift.
+"""
+from collections import Counter
+
+from django.apps import apps as global_apps
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _add(model, field, deltas):
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            model.objects.filter(pk=pk).update(**{field: F(field) + delta})
+
+
+def change_status_counts(deltas):
+    from task_manager.statuses.models import Status
+    _add(Status, 'task_count', deltas)
+
+
+def change_label_counts(deltas):
+    from task_manager.labels.models import Label
+    _add(Label, 'task_count', deltas)
+
+
+def change_user_counts(created=None, assigned=None):
+    from task_manager.users.models import UserTaskStats
+    for field, deltas in (('created_count', created or {}),
+                          ('assigned_count', assigned or {})):
+        for user_id, delta in deltas.items():
+            if user_id is None or not delta:
+                continue
+            updated = UserTaskStats.objects.filter(pk=user_id).update(
+                **{field: F(field) + delta})
+            if not updated:
+                recount_user_counters(user_ids=[user_id])
+
+
+def counted_relations(task):
+    return task.status_id, task.creator_id, task.executor_id
+
+
+def count_tasks(tasks, sign=1):
+    """Apply the counters of ``tasks`` (iterable of ``(status_id,
+    creator_id, executor_id)``) with the given sign."""
+    statuses, created, assigned = Counter(), Counter(), Counter()
+    for status_id, creator_id, executor_id in tasks:
+        statuses[status_id] += sign
+        created[creator_id] += sign
+        assigned[executor_id] += sign
+    change_status_counts(statuses)
+    change_user_counts(created=created, assigned=assigned)
+
+
+def count_labels(label_ids, sign=1):
+    """Apply one task per occurrence of a label id in ``label_ids``."""
+    change_label_counts({label_id: count * sign
+                         for label_id, count in Counter(label_ids).items()})
+
+
+def _count_subquery(model, group_field, outer='pk'):
+    return Coalesce(Subquery(
+        model.objects.filter(**{group_field: OuterRef(outer)})
+        .order_by().values(group_field)
+        .annotate(count=Count('pk')).values('count')
+    ), Value(0))
+
+
+def recount_user_counters(apps=global_apps, user_ids=None):
+    user_model = apps.get_model('auth', 'User')
+    stats_model = apps.get_model('users', 'UserTaskStats')
+    task_model = apps.get_model('tasks', 'Task')
+    users = user_model.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    missing = users.exclude(
+        pk__in=stats_model.objects.values('user_id')
+    ).values_list('pk', flat=True)
+    stats_model.objects.bulk_create(
+        [stats_model(user_id=pk) for pk in missing.iterator()],
+        batch_size=1000, ignore_conflicts=True)
+    stats = stats_model.objects.all()
+    if user_ids is not None:
+        stats = stats.filter(pk__in=user_ids)
+    stats.update(
+        created_count=_count_subquery(task_model, 'creator'),
+        assigned_count=_count_subquery(task_model, 'executor'))
+
+
+def recount_task_counters(apps=global_apps):
+    """Recompute every counter with one UPDATE per table."""
+    status_model = apps.get_model('statuses', 'Status')
+    label_model = apps.get_model('labels', 'Label')
+    task_model = apps.get_model('tasks', 'Task')
+    status_model.objects.update(
+        task_count=_count_subquery(task_model, 'status'))
+    label_model.objects.update(
+        task_count=_count_subquery(task_model.labels.through, 'label'))
+    recount_user_counters(apps)
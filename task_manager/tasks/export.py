@@ -0,0 +1,73 @@
+"""Streaming serializers for the task export."""
+import csv
+import json
+
+from django.db.models import Prefetch
+
+from task_manager.labels.models import Label
+
+EXPORT_FIELDS = ['id', 'name', 'description', 'status', 'creator',
+                 'executor', 'labels', 'created_at']
+
+
+class Echo:
+    """File-like object handing back what is written to it, so that
+    ``csv.writer`` produces strings for a streaming response."""
+
+    def write(self, value):
+        return value
+
+
+def export_queryset(queryset):
+    """Only the columns the export needs; labels are prefetched once per
+    iterator chunk instead of once per task."""
+    return (queryset
+            .select_related('status', 'creator', 'executor')
+            .only('id', 'name', 'description', 'created_at',
+                  'status__name',
+                  'creator__username', 'creator__first_name',
+                  'creator__last_name',
+                  'executor__username', 'executor__first_name',
+                  'executor__last_name')
+            .prefetch_related(Prefetch('labels',
+                                       queryset=Label.objects.only('name')))
+            .order_by('id'))
+
+
+def _user_name(user):
+    if user is None:
+        return ''
+    return user.get_full_name() or user.username
+
+
+def task_row(task):
+    return {
+        'id': task.id,
+        'name': task.name,
+        'description': task.description,
+        'status': task.status.name,
+        'creator': _user_name(task.creator),
+        'executor': _user_name(task.executor),
+        'labels': [label.name for label in task.labels.all()],
+        'created_at': task.created_at.isoformat(),
+    }
+
+
+def stream_csv(tasks):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for task in tasks:
+        row = task_row(task)
+        row['labels'] = ', '.join(row['labels'])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def stream_jsonl(tasks):
+    for task in tasks:
+        yield json.dumps(task_row(task), ensure_ascii=False) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'jsonl': (stream_jsonl, 'application/x-ndjson'),
+}
@@ -1,10 +1,19 @@
 from django.contrib.auth.models import User
 from django import forms
 from .models import Task
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
 from django.utils.translation import gettext_lazy as _
+from task_manager.choices import (get_label_choices, get_status_choices,
+                                  get_user_choices)
+
+BLANK_CHOICE = [('', '---------')]
 
 
 class TaskForm(forms.ModelForm):
+    # Version the form was rendered from, for the conflict check on save.
+    version = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
     class Meta:
         model = Task
         fields = ['name', 'description', 'status', 'executor', 'labels']
@@ -36,9 +45,75 @@ class TaskForm(forms.ModelForm):
         self.fields['executor'].label = _('Executor')
         self.fields['executor'].required = False
         self.fields['executor'].queryset = User.objects.all()
-        self.fields['executor'].label_from_instance = lambda \
-            user: user.get_full_name() or user.username
+        # Options are rendered from the cached choices; the querysets
+        # are still used to validate the submitted ids.
+        self.fields['status'].choices = BLANK_CHOICE + get_status_choices()
+        self.fields['executor'].choices = BLANK_CHOICE + get_user_choices()
+        self.fields['labels'].choices = get_label_choices()
         self.fields['executor'].widget.attrs.update(
             {'id': 'id_executor', 'class': 'form-control'})
-        if self.instance and self.instance.pk and self.instance.executor:
-            self.initial['executor'] = self.instance.executor.id
+        if self.instance and self.instance.pk and self.instance.executor_id:
+            self.initial['executor'] = self.instance.executor_id
+        if self.instance and self.instance.pk:
+            self.initial['version'] = self.instance.version
+
+
+class TaskIdsField(forms.Field):
+    """List of task ids posted by the checkboxes of the task list."""
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        'invalid': _('Invalid task selection'),
+    }
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(item) for item in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError(self.error_messages['invalid'],
+                                        code='invalid')
+
+
+class TaskBulkForm(forms.Form):
+    SET_STATUS = 'set_status'
+    SET_EXECUTOR = 'set_executor'
+    ADD_LABELS = 'add_labels'
+    REMOVE_LABELS = 'remove_labels'
+    DELETE = 'delete'
+    ACTIONS = [
+        (SET_STATUS, _('Change status')),
+        (SET_EXECUTOR, _('Change executor')),
+        (ADD_LABELS, _('Add labels')),
+        (REMOVE_LABELS, _('Remove labels')),
+        (DELETE, _('Delete')),
+    ]
+
+    action = forms.ChoiceField(choices=ACTIONS)
+    tasks = TaskIdsField(required=False)
+    select_all = forms.BooleanField(required=False)
+    status = forms.ModelChoiceField(queryset=Status.objects.all(),
+                                    required=False)
+    executor = forms.ModelChoiceField(queryset=User.objects.all(),
+                                      required=False)
+    labels = forms.ModelMultipleChoiceField(queryset=Label.objects.all(),
+                                            required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['status'].choices = BLANK_CHOICE + get_status_choices()
+        self.fields['executor'].choices = BLANK_CHOICE + get_user_choices()
+        self.fields['labels'].choices = get_label_choices()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('tasks') and not cleaned_data.get(
+                'select_all'):
+            raise forms.ValidationError(_('Select at least one task'))
+        action = cleaned_data.get('action')
+        if action == self.SET_STATUS and not cleaned_data.get('status'):
+            self.add_error('status', _('This field is required'))
+        if (action in (self.ADD_LABELS, self.REMOVE_LABELS)
+                and not cleaned_data.get('labels')):
+            self.add_error('labels', _('This field is required'))
+        return cleaned_data
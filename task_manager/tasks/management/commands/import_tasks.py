@@ -0,0 +1,171 @@
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import bulk_create_tasks
+from task_manager.tasks.models import Task
+
+
+class RowError(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Import tasks from a CSV or JSONL file. Statuses, labels and '
+            'users are referenced by name/username and must already '
+            'exist.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--creator',
+                            help='Username used for rows without creator.')
+        parser.add_argument('--label-separator', default=',',
+                            help='Separator of label names in CSV files.')
+        parser.add_argument('--max-errors', type=int, default=20,
+                            help='How many rejected rows to print.')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'File not found: {path}')
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if file_format not in ('csv', 'jsonl'):
+            raise CommandError('Cannot detect format, use --format')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        self.statuses = dict(Status.objects.values_list('name', 'id'))
+        self.labels = dict(Label.objects.values_list('name', 'id'))
+        self.users = dict(User.objects.values_list('username', 'id'))
+        self.default_creator = None
+        if options['creator']:
+            if options['creator'] not in self.users:
+                raise CommandError(f"Unknown user: {options['creator']}")
+            self.default_creator = self.users[options['creator']]
+        self.label_separator = options['label_separator']
+        self.max_errors = options['max_errors']
+        self.seen_names = set()
+        self.imported = 0
+        self.rejected = 0
+
+        started = time.monotonic()
+        batch = []
+        with path.open(newline='', encoding='utf-8') as stream:
+            for line_no, row in self.read_rows(stream, file_format):
+                try:
+                    batch.append((line_no, *self.build_task(row)))
+                except RowError as error:
+                    self.reject(line_no, error)
+                if len(batch) >= options['batch_size']:
+                    self.flush(batch)
+                    batch = []
+        self.flush(batch)
+
+        elapsed = time.monotonic() - started
+        rate = self.imported / elapsed if elapsed else self.imported
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {self.imported} tasks in {elapsed:.1f}s '
+            f'({rate:.0f} rows/s), rejected {self.rejected}'))
+
+    def read_rows(self, stream, file_format):
+        if file_format == 'csv':
+            # Line 1 holds the header.
+            for line_no, row in enumerate(csv.DictReader(stream), start=2):
+                yield line_no, row
+            return
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            if not isinstance(row, dict):
+                self.reject(line_no, 'not a JSON object')
+                continue
+            yield line_no, row
+
+    def text(self, row, field):
+        """``row[field]`` stripped, ``''`` when missing; JSON rows may
+        hold any type, so anything but a string is rejected."""
+        value = row.get(field)
+        if value is None:
+            return ''
+        if not isinstance(value, str):
+            raise RowError(f'{field} must be a string')
+        return value.strip()
+
+    def build_task(self, row):
+        name = self.text(row, 'name')
+        if not name:
+            raise RowError('name is required')
+        if len(name) > Task._meta.get_field('name').max_length:
+            raise RowError('name is too long')
+        if name in self.seen_names:
+            raise RowError(f'duplicate task name in file: {name}')
+
+        status = self.text(row, 'status')
+        status_id = self.statuses.get(status)
+        if status_id is None:
+            raise RowError(f'unknown status: {status}')
+        creator = self.text(row, 'creator')
+        creator_id = (self.users.get(creator) if creator
+                      else self.default_creator)
+        if creator_id is None:
+            raise RowError(f'unknown creator: {creator}')
+        executor_id = None
+        executor = self.text(row, 'executor')
+        if executor:
+            executor_id = self.users.get(executor)
+            if executor_id is None:
+                raise RowError(f'unknown executor: {executor}')
+        description = self.text(row, 'description')
+
+        label_names = row.get('labels') or []
+        if isinstance(label_names, str):
+            label_names = label_names.split(self.label_separator)
+        if not isinstance(label_names, list) or not all(
+                isinstance(label_name, str) for label_name in label_names):
+            raise RowError('labels must be a list of strings')
+        label_ids = []
+        for label_name in filter(None, (n.strip() for n in label_names)):
+            if label_name not in self.labels:
+                raise RowError(f'unknown label: {label_name}')
+            label_ids.append(self.labels[label_name])
+
+        self.seen_names.add(name)
+        task = Task(name=name, description=description,
+                    status_id=status_id, creator_id=creator_id,
+                    executor_id=executor_id)
+        return task, label_ids
+
+    def flush(self, batch):
+        if not batch:
+            return
+        existing = set(Task.objects.filter(
+            name__in=[task.name for __, task, __ in batch]
+        ).values_list('name', flat=True))
+        accepted = []
+        for line_no, task, label_ids in batch:
+            if task.name in existing:
+                self.reject(line_no, f'task already exists: {task.name}')
+            else:
+                accepted.append((task, label_ids))
+        if accepted:
+            tasks, label_ids = zip(*accepted)
+            bulk_create_tasks(list(tasks), list(label_ids))
+            self.imported += len(accepted)
+
+    def reject(self, line_no, error):
+        self.rejected += 1
+        if self.rejected <= self.max_errors:
+            self.stderr.write(f'Line {line_no}: {error}')
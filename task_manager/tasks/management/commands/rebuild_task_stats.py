@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.tasks.stats import rebuild_task_stats
+from task_manager.versions import bump_versions
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the task statistics summary tables from the tasks '
+            'table.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with transaction.atomic():
+            rebuild_task_stats()
+            bump_versions('tasks')
+        self.stdout.write(self.style.SUCCESS(
+            f'Task statistics rebuilt in {time.monotonic() - started:.1f}s'))
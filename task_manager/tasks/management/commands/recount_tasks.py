@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.tasks.counters import recount_task_counters
+from task_manager.versions import bump_versions
+
+
+class Command(BaseCommand):
+    help = ('Recompute the task counters of statuses, labels and users '
+            'from the tasks table.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with transaction.atomic():
+            recount_task_counters()
+            bump_versions('statuses', 'labels', 'users')
+        self.stdout.write(self.style.SUCCESS(
+            f'Task counters recomputed in {time.monotonic() - started:.1f}s'))
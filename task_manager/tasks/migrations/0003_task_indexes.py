@@ -0,0 +1,53 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+        ('statuses', '0001_initial'),
+        ('tasks', '0002_task_labels'),
+    ]
+
+    operations = [
+        # The through table already exists; only tell the migration state
+        # about it so that it can be indexed like a regular model.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TaskLabel',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tasks.task')),
+                        ('label', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='labels.label')),
+                    ],
+                    options={
+                        'db_table': 'tasks_task_labels',
+                        'unique_together': {('task', 'label')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='task',
+                    name='labels',
+                    field=models.ManyToManyField(blank=True, related_name='tasks', through='tasks.TaskLabel', to='labels.label'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'created_at'], name='task_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['executor', 'created_at'], name='task_executor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['creator', 'created_at'], name='task_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklabel',
+            index=models.Index(fields=['label', 'task'], name='tasklabel_label_task_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import task_manager.tasks.search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSearchEntry',
+            fields=[
+                ('task', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='tasks.task')),
+                ('document', task_manager.tasks.search.FullTextDocumentField(db_column='tasks_task_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'tasks_task_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(
+            task_manager.tasks.search.install_search_index,
+            task_manager.tasks.search.remove_search_index,
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def recount(apps, schema_editor):
+    from task_manager.tasks.counters import recount_task_counters
+    recount_task_counters(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_label_task_count'),
+        ('statuses', '0002_status_task_count'),
+        ('tasks', '0004_task_search'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(recount, migrations.RunPython.noop),
+    ]
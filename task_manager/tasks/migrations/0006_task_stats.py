@@ -0,0 +1,41 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def rebuild(apps, schema_editor):
+    from task_manager.tasks.stats import rebuild_task_stats
+    rebuild_task_stats(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0002_status_task_count'),
+        ('tasks', '0005_recount_task_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskStatusExecutorCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('executor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='statuses.status')),
+            ],
+            options={
+                'unique_together': {('status', 'executor')},
+            },
+        ),
+        migrations.RunPython(rebuild, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+import task_manager.tasks.search
+
+
+def copy_created_at(apps, schema_editor):
+    task_model = apps.get_model('tasks', 'Task')
+    task_model.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        # Adding the column rebuilds tasks_task on SQLite, which drops
+        # the full-text search triggers.
+        migrations.RunPython(task_manager.tasks.search.install_search_index,
+                             migrations.RunPython.noop),
+    ]
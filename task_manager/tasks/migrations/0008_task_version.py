@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+import task_manager.tasks.search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at'],
+                               name='task_updated_at_idx'),
+        ),
+        # Adding the column rebuilds tasks_task on SQLite, which drops
+        # the full-text search triggers.
+        migrations.RunPython(task_manager.tasks.search.install_search_index,
+                             migrations.RunPython.noop),
+    ]
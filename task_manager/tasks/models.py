@@ -1,5 +1,59 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+from .search import FullTextDocumentField, search_tasks
+
+
+class TaskQuerySet(models.QuerySet):
+    def for_list(self):
+        """Projection used by task tables: joins and prefetches everything
+        a row renders and skips the potentially large description."""
+        return (self.select_related('status', 'creator', 'executor')
+                .prefetch_related('labels')
+                .defer('description'))
+
+    def for_detail(self):
+        return (self.select_related('status', 'creator', 'executor')
+                .prefetch_related('labels'))
+
+    def filter_by_params(self, params, user):
+        """Apply the task list filters taken from request GET
+        parameters."""
+        queryset = self
+        status_id = params.get('status')
+        if status_id:
+            queryset = queryset.filter(status_id=status_id)
+        executor_id = params.get('executor')
+        if executor_id:
+            queryset = queryset.filter(executor_id=executor_id)
+        label_id = params.get('label')
+        if label_id:
+            queryset = queryset.filter(labels__id=label_id)
+        only_my_tasks = params.get('my_tasks')
+        if only_my_tasks:
+            queryset = queryset.filter(creator=user)
+        search_text = params.get('q', '').strip()
+        if search_text:
+            queryset = queryset.search(search_text)
+        return queryset
+
+    def touch(self, **values):
+        """Mark the tasks as changed, for caches and edit forms relying
+        on ``updated_at`` and ``version``, when a write bypasses
+        ``Task.save``."""
+        return self.update(updated_at=timezone.now(),
+                           version=models.F('version') + 1, **values)
+
+    def claim(self, pk, version):
+        """Move the task from ``version`` to the next one only if nobody
+        else did; return whether this caller won."""
+        return bool(self.filter(pk=pk, version=version).update(
+            version=version + 1))
+
+    def search(self, text):
+        """Full-text search on name and description, annotating
+        ``search_rank`` (higher is better)."""
+        return search_tasks(self, text)
 
 
 class Task(models.Model):
@@ -13,8 +67,100 @@ class Task(models.Model):
                                  related_name='assigned_tasks', null=True,
                                  blank=True)
     labels = models.ManyToManyField('labels.Label', blank=True,
-                                    related_name='tasks')
+                                    related_name='tasks',
+                                    through='TaskLabel')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    COUNTED_FIELDS = ('status_id', 'creator_id', 'executor_id')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'],
+                         name='task_status_created_idx'),
+            models.Index(fields=['executor', 'created_at'],
+                         name='task_executor_created_idx'),
+            models.Index(fields=['creator', 'created_at'],
+                         name='task_creator_created_idx'),
+            models.Index(fields=['updated_at'],
+                         name='task_updated_at_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        # Increment in SQL so a stale instance can't move the version
+        # backwards; the new value is loaded again on first access.
+        self.version = models.F('version') + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            del self.version
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot what the counters were computed from, so that a later
+        # save can move them without reading the row again.
+        if all(field in instance.__dict__ for field in cls.COUNTED_FIELDS):
+            instance._counted_relations = tuple(
+                instance.__dict__[field] for field in cls.COUNTED_FIELDS)
+        return instance
+
+
+class TaskLabel(models.Model):
+    """Explicit through model of ``Task.labels`` over the table Django
+    created implicitly, so it can carry a label-first index."""
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    label = models.ForeignKey('labels.Label', on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'tasks_task_labels'
+        unique_together = [('task', 'label')]
+        indexes = [
+            models.Index(fields=['label', 'task'],
+                         name='tasklabel_label_task_idx'),
+        ]
+
+
+class TaskSearchEntry(models.Model):
+    """Row of the SQLite FTS5 index of task texts, maintained by triggers
+    (see ``search.py``). Only used for joins when searching on SQLite."""
+    task = models.OneToOneField(Task, on_delete=models.DO_NOTHING,
+                                primary_key=True, db_column='rowid',
+                                related_name='search_entry')
+    document = FullTextDocumentField(db_column='tasks_task_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'tasks_task_fts'
+
+
+class TaskStatusExecutorCount(models.Model):
+    """Number of tasks per status and executor (``None`` for unassigned),
+    maintained incrementally by ``stats.py``."""
+    status = models.ForeignKey('statuses.Status', on_delete=models.CASCADE,
+                               related_name='+')
+    executor = models.ForeignKey(User, on_delete=models.CASCADE, null=True,
+                                 related_name='+')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = [('status', 'executor')]
+
+
+class TaskDailyCount(models.Model):
+    """Number of tasks created per day, maintained incrementally by
+    ``stats.py``."""
+    day = models.DateField(unique=True)
+    count = models.IntegerField(default=0)
@@ -0,0 +1,129 @@
+"""Full-text search over task names and descriptions.
+
+PostgreSQL uses a GIN expression index over ``to_tsvector``. SQLite keeps
+an external-content FTS5 table, ``tasks_task_fts``, in sync with
+``tasks_task`` through triggers, so bulk inserts are indexed as well.
+Other backends fall back to a plain ``icontains`` filter.
+"""
+import re
+
+from django.db import connections
+from django.db.models import F, FloatField, Lookup, TextField, Value
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'simple'
+POSTGRES_INDEX_NAME = 'task_search_gin_idx'
+
+SQLITE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+    name, description, content='tasks_task', content_rowid='id'
+)
+"""
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_insert
+    AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_delete
+    AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_update
+    AFTER UPDATE OF name, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_task_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+
+class FullTextDocumentField(TextField):
+    """The hidden column of an FTS5 table that ``MATCH`` is applied to."""
+
+
+@FullTextDocumentField.register_lookup
+class FullTextMatch(Lookup):
+    lookup_name = 'matches'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+def search_vector():
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('name', 'description', config=SEARCH_CONFIG)
+
+
+def install_search_index(apps, schema_editor):
+    """Create the vendor specific search index. Also used by migrations
+    that rebuild ``tasks_task`` on SQLite, which drops its triggers."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        task_model = apps.get_model('tasks', 'Task')
+        schema_editor.execute(
+            f'DROP INDEX IF EXISTS {POSTGRES_INDEX_NAME}')
+        schema_editor.add_index(task_model, GinIndex(
+            search_vector(), name=POSTGRES_INDEX_NAME))
+    elif vendor == 'sqlite':
+        schema_editor.execute(SQLITE_FTS_TABLE)
+        for trigger in SQLITE_TRIGGERS:
+            schema_editor.execute(trigger)
+        schema_editor.execute(
+            "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')")
+
+
+def remove_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_INDEX_NAME}')
+    elif vendor == 'sqlite':
+        for name in ('insert', 'delete', 'update'):
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS tasks_task_fts_{name}')
+        schema_editor.execute('DROP TABLE IF EXISTS tasks_task_fts')
+
+
+def fts5_query(text):
+    """Turn user input into an FTS5 query matching every word as a
+    prefix; quoting keeps FTS5 operators in the input harmless."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+def search_tasks(queryset, text):
+    """Filter ``queryset`` by ``text`` and annotate ``search_rank``,
+    where a higher rank is a better match."""
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        query = SearchQuery(text, config=SEARCH_CONFIG,
+                            search_type='websearch')
+        vector = search_vector()
+        # ts_rank returns float4; casting keeps cursor values exact.
+        return (queryset
+                .annotate(search_document=vector)
+                .filter(search_document=query)
+                .annotate(search_rank=Cast(SearchRank(vector, query),
+                                           FloatField())))
+    if vendor == 'sqlite':
+        match = fts5_query(text)
+        if not match:
+            return queryset.none()
+        # bm25() is lower for better matches.
+        return (queryset
+                .filter(search_entry__document__matches=match)
+                .annotate(search_rank=-F('search_entry__rank')))
+    return (queryset.filter(name__icontains=text)
+            | queryset.filter(description__icontains=text)).annotate(
+        search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,79 @@
+"""Signal handlers maintaining the denormalized task counters, the
+statistics summary tables and ``Task.updated_at`` on label changes."""
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from .counters import count_labels, count_tasks, counted_relations
+from .models import Task, TaskLabel
+from .stats import count_task_stats, task_day
+
+
+def stats_key(relations, task):
+    status_id, _, executor_id = relations
+    return status_id, executor_id, task_day(task)
+
+
+@receiver(pre_save, sender=Task)
+def remember_counted_relations(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if not hasattr(instance, '_counted_relations'):
+        instance._counted_relations = Task.objects.filter(
+            pk=instance.pk).values_list(*Task.COUNTED_FIELDS).first()
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = counted_relations(instance)
+    previous = getattr(instance, '_counted_relations', None)
+    if created:
+        count_tasks([current])
+        count_task_stats([stats_key(current, instance)])
+    elif previous is not None and previous != current:
+        count_tasks([previous], sign=-1)
+        count_tasks([current])
+        if stats_key(previous, instance) != stats_key(current, instance):
+            count_task_stats([stats_key(previous, instance)], sign=-1)
+            count_task_stats([stats_key(current, instance)])
+    instance._counted_relations = current
+
+
+@receiver(pre_delete, sender=Task)
+def remember_deleted_labels(sender, instance, **kwargs):
+    # The through rows are removed by the cascade without m2m signals.
+    instance._deleted_label_ids = list(TaskLabel.objects.filter(
+        task_id=instance.pk).values_list('label_id', flat=True))
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    current = counted_relations(instance)
+    count_tasks([current], sign=-1)
+    count_task_stats([stats_key(current, instance)], sign=-1)
+    count_labels(getattr(instance, '_deleted_label_ids', []), sign=-1)
+
+
+@receiver(m2m_changed, sender=TaskLabel)
+def count_label_changes(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('pre_remove', 'pre_clear'):
+        links = TaskLabel.objects.filter(
+            **{'label_id' if reverse else 'task_id': instance.pk})
+        if action == 'pre_remove':
+            links = links.filter(
+                **{'task_id__in' if reverse else 'label_id__in': pk_set})
+        # Only links that really exist are removed from the counters.
+        instance._removed_links = list(
+            links.values_list('task_id', 'label_id'))
+    elif action == 'post_add':
+        count_labels([instance.pk] * len(pk_set) if reverse else pk_set)
+        Task.objects.filter(
+            pk__in=pk_set if reverse else [instance.pk]).touch()
+    elif action in ('post_remove', 'post_clear'):
+        removed = instance.__dict__.pop('_removed_links', [])
+        count_labels([label_id for _, label_id in removed], sign=-1)
+        if removed:
+            Task.objects.filter(
+                pk__in={task_id for task_id, _ in removed}).touch()
@@ -0,0 +1,137 @@
+"""Summary tables behind the task statistics dashboard.
+
+``TaskStatusExecutorCount`` and ``TaskDailyCount`` are moved by the signal
+handlers in ``signals.py`` and by the bulk helpers, so the dashboard reads
+a few hundred summary rows instead of grouping the whole tasks table.
+``rebuild_task_stats`` recomputes both tables from the tasks.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def task_day(task):
+    return timezone.localdate(task.created_at)
+
+
+def _lookup(values):
+    return {f'{field}__isnull' if value is None else field:
+            True if value is None else value
+            for field, value in values.items()}
+
+
+def _add(queryset, deltas, key_fields):
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        values = dict(zip(key_fields, key))
+        rows = queryset.filter(**_lookup(values))
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                queryset.create(count=delta, **values)
+        except IntegrityError:
+            # Another transaction created the row in the meantime.
+            rows.update(count=F('count') + delta)
+
+
+def change_status_executor_counts(deltas):
+    """Apply ``{(status_id, executor_id): delta}``."""
+    from .models import TaskStatusExecutorCount
+    _add(TaskStatusExecutorCount.objects, deltas,
+         ('status_id', 'executor_id'))
+
+
+def change_daily_counts(deltas):
+    """Apply ``{date: delta}``."""
+    from .models import TaskDailyCount
+    _add(TaskDailyCount.objects, {(day,): delta
+                                  for day, delta in deltas.items()},
+         ('day',))
+
+
+def count_task_stats(tasks, sign=1):
+    """Apply ``tasks`` (iterable of ``(status_id, executor_id, day)``)
+    to both summary tables with the given sign."""
+    pairs, days = Counter(), Counter()
+    for status_id, executor_id, day in tasks:
+        pairs[status_id, executor_id] += sign
+        days[day] += sign
+    change_status_executor_counts(pairs)
+    change_daily_counts(days)
+
+
+def rebuild_task_stats(apps=global_apps):
+    """Replace both summary tables with counts grouped from the tasks."""
+    task_model = apps.get_model('tasks', 'Task')
+    pair_model = apps.get_model('tasks', 'TaskStatusExecutorCount')
+    daily_model = apps.get_model('tasks', 'TaskDailyCount')
+    pair_model.objects.all().delete()
+    daily_model.objects.all().delete()
+    pairs = (task_model.objects.order_by().values('status_id', 'executor_id')
+             .annotate(count=Count('pk')))
+    pair_model.objects.bulk_create(
+        (pair_model(**row) for row in pairs.iterator()), batch_size=1000)
+    days = (task_model.objects.order_by()
+            .values(day=TruncDate('created_at'))
+            .annotate(count=Count('pk')))
+    daily_model.objects.bulk_create(
+        (daily_model(**row) for row in days.iterator()), batch_size=1000)
+
+
+def status_executor_table(statuses, users):
+    """Return ``(rows, totals)`` of the status × executor matrix.
+
+    ``statuses`` and ``users`` are ``(id, name)`` choices; each row is
+    ``(executor_name, counts_per_status, row_total)`` with the unassigned
+    tasks last, and ``totals`` holds the column totals plus the grand
+    total.
+    """
+    from .models import TaskStatusExecutorCount
+    counts = {
+        (row['status_id'], row['executor_id']): row['total']
+        for row in TaskStatusExecutorCount.objects.order_by()
+        .values('status_id', 'executor_id').annotate(total=Sum('count'))
+        if row['total']
+    }
+    executor_ids = {executor_id for _, executor_id in counts}
+    executors = [(pk, name) for pk, name in users if pk in executor_ids]
+    if None in executor_ids:
+        executors.append((None, None))
+    rows = []
+    for executor_id, executor_name in executors:
+        cells = [counts.get((status_id, executor_id), 0)
+                 for status_id, _ in statuses]
+        rows.append((executor_name, cells, sum(cells)))
+    totals = [sum(row[1][index] for row in rows)
+              for index in range(len(statuses))]
+    return rows, totals + [sum(totals)]
+
+
+def created_per_period(days=30, weeks=12, today=None):
+    """Return ``(daily, weekly)`` lists of ``(date, count)``, newest first,
+    covering the last ``days`` days and the last ``weeks`` weeks (keyed
+    by their Monday)."""
+    from .models import TaskDailyCount
+    today = today or timezone.localdate()
+    first_week = today - timedelta(days=today.weekday() + 7 * (weeks - 1))
+    first_day = min(first_week, today - timedelta(days=days - 1))
+    counts = dict(TaskDailyCount.objects.filter(day__gte=first_day)
+                  .values_list('day', 'count'))
+    daily = [(day, counts.get(day, 0))
+             for day in (today - timedelta(days=offset)
+                         for offset in range(days))]
+    weekly = Counter()
+    for day, count in counts.items():
+        if day >= first_week:
+            weekly[day - timedelta(days=day.weekday())] += count
+    weekly = [(week, weekly[week])
+              for week in (first_week + timedelta(weeks=offset)
+                           for offset in reversed(range(weeks)))]
+    return daily, weekly
@@ -1,9 +1,21 @@
 from django.urls import path
+from task_manager.mixins import read_view
 from . import views
 
 urlpatterns = [
     path('',
-         views.TaskListView.as_view(), name='task_list'),
+         read_view(views.TaskListView, views.TaskListAsyncView),
+         name='task_list'),
+    path('async/',
+         views.TaskListAsyncView.as_view(), name='task_list_async'),
+    path('export/',
+         views.TaskExportView.as_view(), name='task_export'),
+    path('events/',
+         views.TaskEventsView.as_view(), name='task_events'),
+    path('bulk/',
+         views.TaskBulkView.as_view(), name='task_bulk'),
+    path('stats/',
+         views.TaskStatsView.as_view(), name='task_stats'),
     path('create/',
          views.TaskCreateView.as_view(), name='task_create'),
     path('<int:pk>/update/',
@@ -11,5 +23,8 @@ urlpatterns = [
     path('<int:pk>/delete/',
          views.TaskDeleteView.as_view(), name='task_delete'),
     path('<int:pk>/',
-         views.TaskDetailView.as_view(), name='task_detail'),
+         read_view(views.TaskDetailView, views.TaskDetailAsyncView),
+         name='task_detail'),
+    path('<int:pk>/async/',
+         views.TaskDetailAsyncView.as_view(), name='task_detail_async'),
 ]
@@ -1,47 +1,245 @@
+import asyncio
+import json
 from django.views.generic import (ListView, CreateView, UpdateView, DeleteView,
-                                  DetailView)
-from django.urls import reverse_lazy
+                                  DetailView, TemplateView, View)
+from django.urls import reverse, reverse_lazy
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
 from django.shortcuts import redirect
-from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.translation import ngettext
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import (HttpResponse, HttpResponseBadRequest,
+                         HttpResponseForbidden, StreamingHttpResponse)
 from .models import Task
-from .forms import TaskForm
-from task_manager.statuses.models import Status
+from .forms import TaskBulkForm, TaskForm
+from .bulk import (bulk_add_labels, bulk_delete_tasks, bulk_remove_labels,
+                   bulk_update_tasks)
+from .export import EXPORT_FORMATS, export_queryset
+from .stats import created_per_period, status_executor_table
 from task_manager.labels.models import Label
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.events import CREATED, DELETED, broker, task_matches
+from task_manager.choices import (get_label_choices, get_status_choices,
+                                  get_user_choices)
+from task_manager.mixins import (AsyncDetailViewMixin, ConditionalGetMixin,
+                                 CustomLoginRequiredMixin, ReplicaReadMixin)
+from task_manager.pagination import (AsyncKeysetListMixin,
+                                     KeysetPaginationMixin)
+from task_manager.routers import uses_replica
 from django.utils.translation import gettext_lazy as _
 
 
-class TaskListView(CustomLoginRequiredMixin, ListView):
+def fragment_cache_context(view):
+    """Timeout and version stamps of the tables rendered in cached task
+    fragments; the fragments are also keyed by ``Task.updated_at``.
+
+    Fragments rendered from the replica are not stored: its rows may be
+    older than the primary's stamps they would be keyed by.
+    """
+    timeout = (0 if uses_replica(view.request)
+               else settings.FRAGMENT_CACHE_TIMEOUT)
+    return dict(view.get_versions('statuses', 'users', 'labels'),
+                timeout=timeout)
+
+
+class TaskListView(CustomLoginRequiredMixin, ConditionalGetMixin,
+                   ReplicaReadMixin, KeysetPaginationMixin, ListView):
     model = Task
+    queryset = Task.objects.for_list()
     template_name = 'tasks/tasks.html'
     context_object_name = 'tasks'
+    etag_versions = ('tasks', 'statuses', 'users', 'labels')
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        status_id = self.request.GET.get('status')
-        if status_id:
-            queryset = queryset.filter(status_id=status_id)
-        executor_id = self.request.GET.get('executor')
-        if executor_id:
-            queryset = queryset.filter(executor_id=executor_id)
-        label_id = self.request.GET.get('label')
-        if label_id:
-            queryset = queryset.filter(labels__id=label_id)
-        only_my_tasks = self.request.GET.get('my_tasks')
-        if only_my_tasks:
-            queryset = queryset.filter(creator=self.request.user)
-        return queryset
+        return super().get_queryset().filter_by_params(self.request.GET,
+                                                       self.request.user)
+
+    def get_cursor_ordering(self):
+        if self.request.GET.get('q', '').strip():
+            return ('-search_rank', 'id')
+        return super().get_cursor_ordering()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['statuses'] = Status.objects.all()
-        context['users'] = User.objects.all()
-        context['labels'] = Label.objects.all()
+        versions = self.get_versions('statuses', 'users', 'labels')
+        context['statuses'] = get_status_choices(versions['statuses'])
+        context['users'] = get_user_choices(versions['users'])
+        context['labels'] = get_label_choices(versions['labels'])
+        context['bulk_actions'] = TaskBulkForm.ACTIONS
+        context['fragment_cache'] = fragment_cache_context(self)
+        context['events_enabled'] = settings.EVENTS_ENABLED
         return context
 
 
+class TaskListAsyncView(AsyncKeysetListMixin, TaskListView):
+    pass
+
+
+class TaskExportView(CustomLoginRequiredMixin, View):
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest(_('Unsupported export format'))
+        serializer, content_type = EXPORT_FORMATS[export_format]
+        queryset = export_queryset(
+            Task.objects.filter_by_params(request.GET, request.user))
+        response = StreamingHttpResponse(
+            serializer(queryset.iterator(chunk_size=self.chunk_size)),
+            content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="tasks.{export_format}"')
+        return response
+
+
+class TaskBulkView(CustomLoginRequiredMixin, View):
+    """Apply one action to the checked tasks or to every task matching
+    the task list filters in the query string."""
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        form = TaskBulkForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return self.redirect_to_list()
+        data = form.cleaned_data
+        queryset = Task.objects.filter_by_params(request.GET, request.user)
+        if not data['select_all']:
+            queryset = queryset.filter(pk__in=data['tasks'])
+        action = data['action']
+        if action == TaskBulkForm.DELETE:
+            self.delete(queryset)
+            return self.redirect_to_list()
+        if action == TaskBulkForm.SET_STATUS:
+            count = bulk_update_tasks(queryset, status_id=data['status'].pk)
+        elif action == TaskBulkForm.SET_EXECUTOR:
+            executor = data['executor']
+            count = bulk_update_tasks(
+                queryset, executor_id=executor.pk if executor else None)
+        elif action == TaskBulkForm.ADD_LABELS:
+            count = bulk_add_labels(
+                queryset, [label.pk for label in data['labels']])
+        else:
+            count = bulk_remove_labels(
+                queryset, [label.pk for label in data['labels']])
+        messages.success(request, ngettext(
+            '%(count)d task was updated', '%(count)d tasks were updated',
+            count) % {'count': count})
+        return self.redirect_to_list()
+
+    def delete(self, queryset):
+        # Same rule as TaskDeleteView, checked in the DELETE's WHERE.
+        total = queryset.count()
+        count = bulk_delete_tasks(queryset.filter(creator=self.request.user))
+        messages.success(self.request, ngettext(
+            '%(count)d task was deleted', '%(count)d tasks were deleted',
+            count) % {'count': count})
+        if count < total:
+            messages.error(self.request, ngettext(
+                '%(count)d task was skipped: only the task creator can '
+                'delete it',
+                '%(count)d tasks were skipped: only the task creator can '
+                'delete them',
+                total - count) % {'count': total - count})
+
+    def redirect_to_list(self):
+        query = self.request.GET.urlencode()
+        return redirect(f'{reverse("task_list")}?{query}' if query
+                        else reverse('task_list'))
+
+
+class TaskStatsView(CustomLoginRequiredMixin, ConditionalGetMixin,
+                    TemplateView):
+    template_name = 'tasks/stats.html'
+    days = 30
+    weeks = 12
+    etag_versions = ('tasks', 'statuses', 'users', 'labels')
+
+    def get_etag_parts(self):
+        # The periods move on at midnight even without writes.
+        return timezone.localdate()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        versions = self.get_versions('statuses', 'users')
+        statuses = get_status_choices(versions['statuses'])
+        rows, totals = status_executor_table(
+            statuses, get_user_choices(versions['users']))
+        daily, weekly = created_per_period(self.days, self.weeks)
+        context['statuses'] = statuses
+        context['executor_rows'] = rows
+        context['status_totals'] = totals
+        context['labels'] = (Label.objects.filter(task_count__gt=0)
+                             .order_by('-task_count', 'name')
+                             .values_list('name', 'task_count'))
+        context['daily'] = daily
+        context['weekly'] = weekly
+        return context
+
+
+class TaskEventsView(View):
+    """Server-sent events for the tasks matching the task list filters.
+
+    Only served under ASGI, where an idle stream waits on its queue
+    without holding a worker thread; under WSGI the view answers 204,
+    which tells ``EventSource`` not to reconnect. A task that stops
+    matching the filters is sent as ``removed``.
+    """
+    retry = 5000
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponseForbidden()
+        response = StreamingHttpResponse(
+            self.stream(request.GET.copy(), user.pk),
+            content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, params, user_id):
+        subscription = broker.subscribe()
+        try:
+            yield f'retry: {self.retry}\n\n'
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), settings.EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if event is None:
+                    return
+                kind = await self.filter_event(event, params, user_id)
+                if kind:
+                    yield (f'event: {kind}\n'
+                           f'data: {json.dumps(event["task"])}\n\n')
+        finally:
+            broker.unsubscribe(subscription)
+
+    async def filter_event(self, event, params, user_id):
+        """Return the event name to send for ``event`` or ``None``."""
+        kind, task = event['event'], event['task']
+        if kind == DELETED:
+            return kind
+        matches = task_matches(task, params, user_id)
+        search_text = params.get('q', '').strip()
+        if matches and search_text:
+            matches = await Task.objects.filter(
+                pk=task['id']).search(search_text).aexists()
+        if matches:
+            return kind
+        return None if kind == CREATED else 'removed'
+
+
 class TaskCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Task
     form_class = TaskForm
@@ -49,12 +247,6 @@ class TaskCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     success_url = reverse_lazy('task_list')
     success_message = _('Task was successfully created')
 
-    def get_form(self, form_class=None):
-        form = super().get_form(form_class)
-        if 'executor' in form.fields:
-            form.fields['executor'].queryset = User.objects.all()
-        return form
-
     def form_valid(self, form):
         form.instance.creator = self.request.user
         return super().form_valid(form)
@@ -73,6 +265,10 @@ class TaskUpdateView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
     success_url = reverse_lazy('task_list')
     success_message = _('Task was successfully updated')
 
+    conflict_message = _('The task was changed by someone else while you '
+                         'were editing it. Review your changes and save '
+                         'again to overwrite.')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = _('Edit Task')
@@ -80,7 +276,24 @@ class TaskUpdateView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
         return context
 
     def form_valid(self, form):
-        return super().form_valid(form)
+        # Forms without the hidden version are checked against the
+        # version loaded at the start of this request.
+        version = form.cleaned_data.get('version') or self.object.version
+        with transaction.atomic():
+            if not Task.objects.claim(self.object.pk, version):
+                return self.form_conflict(form)
+            return super().form_valid(form)
+
+    def form_conflict(self, form):
+        """Show the submitted values again, now based on the current
+        version, instead of overwriting a concurrent edit."""
+        data = form.data.copy()
+        data['version'] = Task.objects.filter(
+            pk=self.object.pk).values_list('version', flat=True).first()
+        form.data = data
+        form.add_error(None, self.conflict_message)
+        return self.render_to_response(self.get_context_data(form=form),
+                                       status=409)
 
 
 class TaskDeleteView(CustomLoginRequiredMixin, DeleteView):
@@ -122,7 +335,7 @@ class TaskDeleteView(CustomLoginRequiredMixin, DeleteView):
 
     def dispatch(self, request, *args, **kwargs):
         self.object = self.get_object()
-        if self.request.user != self.object.creator:
+        if self.request.user.pk != self.object.creator_id:
             messages.error(self.request, self.permission_denied_message)
             return redirect('task_list')
         return super().dispatch(request, *args, **kwargs)
@@ -134,13 +347,21 @@ class TaskDeleteView(CustomLoginRequiredMixin, DeleteView):
         return redirect(success_url)
 
 
-class TaskDetailView(CustomLoginRequiredMixin, DetailView):
+class TaskDetailView(CustomLoginRequiredMixin, ConditionalGetMixin,
+                     ReplicaReadMixin, DetailView):
     model = Task
+    queryset = Task.objects.for_detail()
     template_name = 'tasks/task.html'
     context_object_name = 'task'
+    etag_versions = ('tasks', 'statuses', 'users', 'labels')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         form = TaskForm()
         context['labels_label'] = form.fields['labels'].label
+        context['fragment_cache'] = fragment_cache_context(self)
         return context
+
+
+class TaskDetailAsyncView(AsyncDetailViewMixin, TaskDetailView):
+    pass
@@ -0,0 +1,80 @@
+"""Tests for the JSON API in task manager app."""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from .test_base import BaseTestCase
+
+
+class TaskAPITestCase(BaseTestCase):
+    """Class for JSON API test cases."""
+
+    def setUp(self):
+        """Setup for API tests."""
+        super().setUp()
+        self.status = Status.objects.create(name='Status')
+        self.label = Label.objects.create(name='Label')
+        self.tasks = [
+            Task.objects.create(name=f'Task {i}', status=self.status,
+                                creator=self.user, executor=self.user2)
+            for i in range(3)
+        ]
+        self.tasks[0].labels.add(self.label)
+        self.url = reverse('api_task_list')
+        self.login_user()
+
+    def test_requires_login(self):
+        """Anonymous clients are refused."""
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_sparse_fields(self):
+        """Only requested columns are selected and returned."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'name,labels'})
+        self.assertEqual(response.json()['results'][0],
+                         {'name': 'Task 0', 'labels': [self.label.pk]})
+        task_query = next(query['sql'] for query in queries
+                          if 'FROM "tasks_task"' in query['sql'])
+        self.assertNotIn('description', task_query)
+        response = self.client.get(self.url, {'fields': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_filters_and_pagination(self):
+        """Filters are shared with the HTML list and pages chain."""
+        response = self.client.get(self.url, {'label': self.label.pk})
+        self.assertEqual([row['id'] for row in response.json()['results']],
+                         [self.tasks[0].pk])
+        response = self.client.get(self.url, {'page_size': 2,
+                                              'fields': 'id'})
+        data = response.json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNone(data['previous'])
+        data = self.client.get(data['next']).json()
+        self.assertEqual(data['results'], [{'id': self.tasks[2].pk}])
+
+    def test_conditional_get(self):
+        """Unchanged tables answer 304 until a write commits."""
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.has_header('Last-Modified'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasks[1].labels.add(self.label)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_other_endpoints(self):
+        """Statuses, labels and users are listed too."""
+        for url_name, expected in (('api_status_list', 'Status'),
+                                   ('api_label_list', 'Label'),
+                                   ('api_user_list', 'darth_vader')):
+            response = self.client.get(reverse(url_name))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, expected)
+            self.assertTrue(response.has_header('ETag'))
@@ -0,0 +1,62 @@
+"""Tests for the async read views in task manager app."""
+from django.urls import reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from .test_base import BaseTestCase
+
+
+class AsyncViewsTestCase(BaseTestCase):
+    """Class for async read view test cases."""
+
+    def setUp(self):
+        """Setup for async view tests."""
+        super().setUp()
+        self.status = Status.objects.create(name='Status')
+        self.label = Label.objects.create(name='Label')
+        self.task = Task.objects.create(name='Task', status=self.status,
+                                        creator=self.user,
+                                        executor=self.user2)
+        self.task.labels.add(self.label)
+
+    async def test_async_views_match_sync_views(self):
+        """Async variants render the same objects as the sync views."""
+        await self.async_client.aforce_login(self.user)
+        for url_name, kwargs, context_name in (
+                ('task_list', {}, 'tasks'),
+                ('task_detail', {'pk': self.task.pk}, 'task'),
+                ('status_list', {}, 'statuses'),
+                ('label_list', {}, 'labels'),
+                ('user_list', {}, 'users')):
+            sync_response = await self.async_client.get(
+                reverse(url_name, kwargs=kwargs))
+            response = await self.async_client.get(
+                reverse(f'{url_name}_async', kwargs=kwargs))
+            self.assertEqual(response.status_code, 200, url_name)
+            self.assertEqual(response.templates[0].name,
+                             sync_response.templates[0].name)
+            expected = sync_response.context[context_name]
+            actual = response.context[context_name]
+            if url_name != 'task_detail':
+                expected, actual = list(expected), list(actual)
+            self.assertEqual(actual, expected, url_name)
+
+    async def test_async_task_list_filters_and_pages(self):
+        """Filters and cursor pages work the same way."""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('task_list_async'),
+            {'label': self.label.pk, 'page_size': 1})
+        self.assertEqual(list(response.context['tasks']), [self.task])
+        self.assertFalse(response.context['page_obj'].has_next())
+        response = await self.async_client.get(
+            reverse('task_detail_async', kwargs={'pk': 0}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_views_require_login(self):
+        """Anonymous users are redirected to the login page."""
+        response = await self.async_client.get(reverse('task_list_async'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith(reverse('login')))
+        response = await self.async_client.get(reverse('user_list_async'))
+        self.assertEqual(response.status_code, 200)
@@ -1,7 +1,10 @@
 """Base test classes and mixins for task manager app."""
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 
 class BaseTestCase(TestCase):
@@ -9,6 +12,7 @@ class BaseTestCase(TestCase):
 
     def setUp(self):
         """Setup for all tests."""
+        cache.clear()
         self.user = User.objects.create_user(
             username='darth_vader',
             password='123456',
@@ -42,6 +46,23 @@ class CRUDTestMixin:
         response = self.client.get(reverse(f'{self.base_url_name}_list'))
         self.assertEqual(response.status_code, 200)
 
+    def test_list_conditional_get(self):
+        """Unchanged list answers 304 without querying the table."""
+        self.login_user()
+        url = reverse(f'{self.base_url_name}_list')
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        table = self.model_class._meta.db_table
+        self.assertFalse([query for query in queries.captured_queries
+                          if table in query['sql']])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.model_class.objects.create(**self.create_data)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
     def test_create_view(self):
         """Test creating a new object."""
         self.login_user()
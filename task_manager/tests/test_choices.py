@@ -0,0 +1,83 @@
+"""Tests for the cached filter and form choices."""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from task_manager.choices import (get_label_choices, get_status_choices,
+                                  get_user_choices)
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.forms import TaskForm
+from task_manager.versions import get_version
+from .test_base import BaseTestCase
+
+
+class ChoicesCacheTestCase(BaseTestCase):
+    """Class for choices cache test cases."""
+
+    def setUp(self):
+        """Setup for choices tests."""
+        super().setUp()
+        self.status = Status.objects.create(name='Cached Status')
+        self.label = Label.objects.create(name='Cached Label')
+
+    def test_choices_are_cached(self):
+        """Choices are loaded once and then served from the cache, only
+        the version stamp is read."""
+        self.assertEqual(get_status_choices(),
+                         [(self.status.pk, 'Cached Status')])
+        with self.assertNumQueries(1):
+            get_status_choices()
+        version = get_version('statuses')
+        with self.assertNumQueries(0):
+            get_status_choices(version)
+
+    def test_user_choices_use_full_name(self):
+        """User choices show the full name or fall back to username."""
+        nameless = User.objects.create_user(username='r2d2', password='123')
+        choices = dict(get_user_choices())
+        self.assertEqual(choices[self.user.pk], 'Darth Vader')
+        self.assertEqual(choices[nameless.pk], 'r2d2')
+
+    def test_choices_invalidated_on_save_and_delete(self):
+        """Saving or deleting a row drops the cached choices."""
+        get_status_choices()
+        get_label_choices()
+        self.status.name = 'Renamed Status'
+        self.status.save()
+        self.assertEqual(get_status_choices(),
+                         [(self.status.pk, 'Renamed Status')])
+        self.label.delete()
+        self.assertEqual(get_label_choices(), [])
+
+    def test_choices_follow_writes_on_other_workers(self):
+        """A status added through another worker's cache shows up in the
+        choices cached by this one."""
+        get_status_choices()
+        other_worker = {alias: dict(options, LOCATION='other-worker')
+                        for alias, options in settings.CACHES.items()}
+        with override_settings(CACHES=other_worker):
+            Status.objects.create(name='Other worker status')
+        self.assertIn('Other worker status',
+                      dict(get_status_choices()).values())
+
+    def test_login_does_not_invalidate_user_choices(self):
+        """Updating last_login keeps the cached user choices."""
+        version = get_version('users')
+        get_user_choices(version)
+        self.login_user()
+        self.assertEqual(get_version('users'), version)
+
+    def test_task_list_and_form_use_cached_choices(self):
+        """Task filters and form render options from the cache."""
+        self.login_user()
+        response = self.client.get(reverse('task_list'))
+        self.assertContains(response, 'Cached Status')
+        self.assertContains(response, 'Cached Label')
+        self.assertContains(response, 'Luke Skywalker')
+
+        form = TaskForm()
+        self.assertIn((self.status.pk, 'Cached Status'),
+                      list(form.fields['status'].choices))
+        self.assertIn((self.label.pk, 'Cached Label'),
+                      list(form.fields['labels'].choices))
@@ -0,0 +1,223 @@
+"""Tests for management commands of task manager app."""
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from django.contrib.sessions.models import Session
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.utils import timezone
+from task_manager.choices import CACHE_KEY, get_status_choices
+from task_manager.management.commands.benchmark import (find_regressions,
+                                                        summarize)
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.versions import get_version, get_versions
+from .test_base import BaseTestCase
+
+
+class PruneSessionsTestCase(BaseTestCase):
+    """Class for prune_sessions command test cases."""
+
+    def test_prune_sessions_in_batches(self):
+        """Only expired sessions are deleted, batch by batch."""
+        now = timezone.now()
+        for i in range(5):
+            Session.objects.create(session_key=f'expired{i}',
+                                   session_data='',
+                                   expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key='active', session_data='',
+                               expire_date=now + timedelta(days=1))
+        out = StringIO()
+        call_command('prune_sessions', batch_size=2, verbosity=2, stdout=out)
+        self.assertEqual(list(Session.objects.values_list('session_key',
+                                                          flat=True)),
+                         ['active'])
+        self.assertIn('Deleted 5 expired sessions', out.getvalue())
+        self.assertEqual(out.getvalue().count('Deleted 2 sessions'), 2)
+
+
+class WarmCachesTestCase(BaseTestCase):
+    """Class for warm_caches command test cases."""
+
+    def test_warm_caches(self):
+        """Choices are cached, so the pickers need no queries."""
+        Status.objects.create(name='New')
+        call_command('warm_caches', stdout=StringIO())
+        key = CACHE_KEY.format('statuses', get_version('statuses'))
+        self.assertEqual(cache.get(key)[0][1], 'New')
+        key = CACHE_KEY.format('users', get_version('users'))
+        self.assertEqual(len(cache.get(key)), 2)
+
+
+class ImportTasksTestCase(BaseTestCase):
+    """Class for import_tasks command test cases."""
+
+    def setUp(self):
+        """Setup for import tests."""
+        super().setUp()
+        self.status = Status.objects.create(name='New')
+        self.bug = Label.objects.create(name='bug')
+        self.ui = Label.objects.create(name='ui')
+        Task.objects.create(name='Existing', status=self.status,
+                            creator=self.user)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_file(self, name, content):
+        """Write an import file to the temporary directory."""
+        path = Path(self.tmp_dir.name) / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def test_import_csv(self):
+        """CSV rows are imported in batches and bad rows are rejected."""
+        path = self.write_file('tasks.csv', (
+            'name,description,status,creator,executor,labels\n'
+            'First,Text,New,darth_vader,luke,"bug, ui"\n'
+            'Second,,New,luke,,\n'
+            'Existing,,New,luke,,\n'
+            'Third,,Unknown,luke,,\n'
+            'Second,,New,luke,,\n'
+            'Fourth,,New,,,bug\n'
+        ))
+        out, err = StringIO(), StringIO()
+        call_command('import_tasks', path, batch_size=2, creator='luke',
+                     stdout=out, stderr=err)
+
+        self.assertIn('Imported 3 tasks', out.getvalue())
+        self.assertIn('rejected 3', out.getvalue())
+        self.assertIn('Line 4: task already exists: Existing', err.getvalue())
+        self.assertIn('Line 5: unknown status: Unknown', err.getvalue())
+        first = Task.objects.get(name='First')
+        self.assertEqual(first.creator, self.user)
+        self.assertEqual(first.executor, self.user2)
+        self.assertEqual(set(first.labels.all()), {self.bug, self.ui})
+        self.assertEqual(Task.objects.get(name='Fourth').creator, self.user2)
+
+    def test_import_jsonl(self):
+        """JSONL rows accept label lists."""
+        rows = [
+            {'name': 'Json task', 'status': 'New', 'creator': 'luke',
+             'labels': ['ui']},
+            {'name': 'Bad label', 'status': 'New', 'creator': 'luke',
+             'labels': ['missing']},
+        ]
+        path = self.write_file(
+            'tasks.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        out, err = StringIO(), StringIO()
+        call_command('import_tasks', path, stdout=out, stderr=err)
+
+        self.assertIn('Imported 1 tasks', out.getvalue())
+        self.assertIn('unknown label: missing', err.getvalue())
+        task = Task.objects.get(name='Json task')
+        self.assertEqual(list(task.labels.all()), [self.ui])
+
+    def test_import_jsonl_rejects_wrong_types(self):
+        """Non-string JSON values are rejected row by row."""
+        rows = [
+            {'name': 5, 'status': 'New', 'creator': 'luke'},
+            {'name': 'Dict status', 'status': {'name': 'New'},
+             'creator': 'luke'},
+            {'name': 'Bad labels', 'status': 'New', 'creator': 'luke',
+             'labels': [{'name': 'ui'}]},
+            {'name': 'Good', 'status': 'New', 'creator': 'luke'},
+        ]
+        path = self.write_file(
+            'tasks.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        out, err = StringIO(), StringIO()
+        call_command('import_tasks', path, stdout=out, stderr=err)
+
+        self.assertIn('Imported 1 tasks', out.getvalue())
+        self.assertIn('rejected 3', out.getvalue())
+        self.assertIn('Line 1: name must be a string', err.getvalue())
+        self.assertIn('Line 2: status must be a string', err.getvalue())
+        self.assertIn('Line 3: labels must be a list of strings',
+                      err.getvalue())
+
+
+class SeedLoadTestCase(BaseTestCase):
+    """Class for seed_load command test cases."""
+
+    def seed(self, prefix, seed=7):
+        """Run seed_load with a small dataset."""
+        call_command('seed_load', users=5, statuses=3, labels=6, tasks=40,
+                     batch_size=15, seed=seed, prefix=prefix,
+                     stdout=StringIO())
+        return list(Task.objects.filter(name__startswith=f'{prefix} task')
+                    .annotate(label_count=Count('labels'))
+                    .order_by('name')
+                    .values_list('description', 'label_count'))
+
+    def test_seed_load_creates_data(self):
+        """Requested amounts of data are created with usable logins."""
+        self.seed('one')
+        self.assertEqual(
+            User.objects.filter(username__startswith='one_').count(), 5)
+        self.assertEqual(
+            Status.objects.filter(name__startswith='one ').count(), 3)
+        self.assertEqual(
+            Label.objects.filter(name__startswith='one ').count(), 6)
+        self.assertTrue(Task.labels.through.objects.filter(
+            task__name__startswith='one task').exists())
+        self.assertTrue(self.client.login(username='one_user_0',
+                                          password='password'))
+
+    def test_seed_load_refreshes_caches(self):
+        """Bulk inserts bump the stamps, so cached choices are reloaded."""
+        names = ('users', 'statuses', 'labels', 'tasks')
+        get_status_choices()
+        versions = get_versions(*names)
+        self.seed('stamps')
+        new_versions = get_versions(*names)
+        for name in names:
+            self.assertNotEqual(new_versions[name], versions[name])
+        self.assertEqual(len(get_status_choices()), 3)
+
+    def test_seed_load_is_deterministic(self):
+        """The same seed generates the same data."""
+        self.assertEqual(self.seed('one'), self.seed('two'))
+        self.assertNotEqual(self.seed('three', seed=8), self.seed('four'))
+
+    def test_seed_load_rejects_used_prefix(self):
+        """Seeding twice with one prefix fails."""
+        self.seed('one')
+        with self.assertRaises(CommandError):
+            self.seed('one')
+
+
+class BenchmarkReportTestCase(BaseTestCase):
+    """Class for benchmark report test cases."""
+
+    def test_summarize(self):
+        """Samples are reduced to percentiles, queries and bytes."""
+        samples = [{'ms': ms, 'queries': 3, 'bytes': 100}
+                   for ms in range(1, 101)]
+        samples[-1]['queries'] = 4
+        summary = summarize(samples)
+        self.assertEqual(summary['requests'], 100)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertAlmostEqual(summary['p95_ms'], 95.05)
+        self.assertEqual(summary['queries'], 4)
+        self.assertEqual(summary['bytes'], 100)
+
+    def test_find_regressions(self):
+        """Slower p95 and extra queries are reported as regressions."""
+        baseline = {'100': {
+            'task_list': {'p95_ms': 10, 'queries': 4},
+            'user_list': {'p95_ms': 10, 'queries': 3},
+        }}
+        results = {'100': {
+            'task_list': {'p95_ms': 12, 'queries': 5},
+            'user_list': {'p95_ms': 15, 'queries': 3},
+            'task_detail': {'p95_ms': 99, 'queries': 9},
+        }}
+        self.assertEqual(find_regressions(results, baseline, 0.25), [
+            '100/task_list: queries 4 -> 5',
+            '100/user_list: p95 10ms -> 15ms',
+        ])
@@ -0,0 +1,120 @@
+"""Tests for denormalized task counters in task manager app."""
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import bulk_create_tasks
+from task_manager.tasks.models import Task
+from task_manager.users.models import UserTaskStats
+from task_manager.versions import get_versions
+from .test_base import BaseTestCase
+
+
+class TaskCountersTestCase(BaseTestCase):
+    """Class for task counters test cases."""
+
+    def setUp(self):
+        """Setup for counters tests."""
+        super().setUp()
+        self.status1 = Status.objects.create(name='Status 1')
+        self.status2 = Status.objects.create(name='Status 2')
+        self.label1 = Label.objects.create(name='Label 1')
+        self.label2 = Label.objects.create(name='Label 2')
+        self.task = Task.objects.create(name='Task', status=self.status1,
+                                        creator=self.user,
+                                        executor=self.user2)
+
+    def assertCounts(self, status1=None, status2=None, label1=None,
+                     label2=None, created=None, assigned=None):
+        """Compare counters with expected values."""
+        expected = {
+            'status1': (self.status1, 'task_count', status1),
+            'status2': (self.status2, 'task_count', status2),
+            'label1': (self.label1, 'task_count', label1),
+            'label2': (self.label2, 'task_count', label2),
+        }
+        for name, (obj, field, value) in expected.items():
+            if value is not None:
+                obj.refresh_from_db()
+                self.assertEqual(getattr(obj, field), value, name)
+        stats = {stats.user_id: stats
+                 for stats in UserTaskStats.objects.all()}
+        if created is not None:
+            self.assertEqual(
+                (stats[self.user.pk].created_count,
+                 stats[self.user2.pk].created_count), created)
+        if assigned is not None:
+            self.assertEqual(
+                (stats[self.user.pk].assigned_count,
+                 stats[self.user2.pk].assigned_count), assigned)
+
+    def test_task_create_update_delete(self):
+        """Counters follow task saves and deletes."""
+        self.assertCounts(status1=1, status2=0, created=(1, 0),
+                          assigned=(0, 1))
+        self.task.status = self.status2
+        self.task.executor = None
+        self.task.save()
+        self.assertCounts(status1=0, status2=1, assigned=(0, 0))
+
+        task = Task.objects.get(pk=self.task.pk)
+        task.labels.add(self.label1)
+        task.delete()
+        self.assertCounts(status2=0, label1=0, created=(0, 0))
+
+    def test_label_changes(self):
+        """Counters follow add, remove and clear from both sides."""
+        self.task.labels.add(self.label1, self.label2)
+        self.task.labels.add(self.label1)
+        self.assertCounts(label1=1, label2=1)
+        self.task.labels.remove(self.label2, self.label2)
+        self.assertCounts(label1=1, label2=0)
+        self.label2.tasks.add(self.task)
+        self.assertCounts(label2=1)
+        self.label2.tasks.clear()
+        self.task.labels.clear()
+        self.assertCounts(label1=0, label2=0)
+        self.task.labels.set([self.label2])
+        self.assertCounts(label1=0, label2=1)
+
+    def test_bulk_create_tasks(self):
+        """Bulk inserts move the counters too."""
+        bulk_create_tasks(
+            [Task(name=f'Bulk {i}', status=self.status2, creator=self.user2)
+             for i in range(3)],
+            [[self.label1.pk], [self.label1.pk, self.label2.pk], []])
+        self.assertCounts(status2=3, label1=2, label2=1, created=(1, 3))
+
+    def test_recount_command(self):
+        """Drifted counters are repaired in bulk."""
+        self.task.labels.add(self.label1)
+        Status.objects.update(task_count=42)
+        Label.objects.update(task_count=-1)
+        UserTaskStats.objects.all().delete()
+        versions = get_versions('statuses', 'labels', 'users')
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('recount_tasks', stdout=StringIO())
+        self.assertCounts(status1=1, status2=0, label1=1, label2=0,
+                          created=(1, 0), assigned=(0, 1))
+        new_versions = get_versions('statuses', 'labels', 'users')
+        for name, version in versions.items():
+            self.assertNotEqual(new_versions[name], version)
+
+    def test_delete_guards_read_counters(self):
+        """Statuses and labels in use are protected by their counter."""
+        self.login_user()
+        self.task.labels.add(self.label1)
+        for url_name, obj in (('status_delete', self.status1),
+                              ('label_delete', self.label1)):
+            self.client.post(reverse(url_name, kwargs={'pk': obj.pk}))
+            self.assertTrue(type(obj).objects.filter(pk=obj.pk).exists())
+
+    def test_list_pages_show_counts(self):
+        """List pages render counters without per-row queries."""
+        self.login_user()
+        response = self.client.get(reverse('user_list'))
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('status_list'))
+        self.assertContains(response, '<td>1</td>', html=True)
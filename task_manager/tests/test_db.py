@@ -0,0 +1,41 @@
+"""Tests for database connection metrics."""
+from unittest.mock import patch
+from django.test import override_settings
+from django.urls import reverse
+from .test_base import BaseTestCase
+
+
+class FakePool:
+    def get_stats(self):
+        return {'requests_num': 10, 'requests_queued': 3,
+                'requests_wait_ms': 1500, 'pool_size': 4,
+                'pool_available': 1, 'pool_max': 4}
+
+
+@override_settings(METRICS_TOKEN='secret')
+class ConnectionMetricsTestCase(BaseTestCase):
+    """Class for connection metrics test cases."""
+
+    def scrape(self):
+        response = self.client.get(reverse('metrics'),
+                                   HTTP_AUTHORIZATION='Bearer secret')
+        return response.content.decode()
+
+    def test_connections_opened(self):
+        """Opened connections are counted per alias."""
+        self.assertIn('db_connections_opened_total{alias="default"}',
+                      self.scrape())
+        self.assertNotIn('db_pool_', self.scrape())
+
+    def test_pool_stats(self):
+        """Pool hits, waits and size are exported when pooling."""
+        with patch('task_manager.db.get_pool', return_value=FakePool()):
+            body = self.scrape()
+        self.assertIn('db_pool_requests_total{alias="default"} 10\n', body)
+        self.assertIn('db_pool_requests_queued_total{alias="default"} 3\n',
+                      body)
+        self.assertIn('db_pool_wait_seconds_total{alias="default"} 1.5\n',
+                      body)
+        self.assertIn('db_pool_requests_errors_total{alias="default"} 0\n',
+                      body)
+        self.assertIn('db_pool_available{alias="default"} 1\n', body)
@@ -0,0 +1,129 @@
+"""Tests for the live task feed in task manager app."""
+import json
+from unittest.mock import patch
+from django.test import override_settings
+from django.urls import reverse
+from task_manager.events import LocalBackend, broker, task_matches
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import bulk_add_labels
+from task_manager.tasks.models import Task
+from .test_base import BaseTestCase
+
+
+class RecordingBackend:
+    """Backend keeping published events in a list."""
+
+    def __init__(self):
+        """Start with no events."""
+        self.batches = []
+        self.events = []
+
+    def publish(self, events):
+        """Record the events."""
+        self.batches.append(events)
+        self.events.extend(events)
+
+    def listen(self):
+        """Nothing to listen to."""
+
+    def wants_events(self):
+        """Always publish."""
+        return True
+
+
+class TaskEventsTestCase(BaseTestCase):
+    """Class for live feed test cases."""
+
+    def setUp(self):
+        """Setup for live feed tests."""
+        super().setUp()
+        self.status = Status.objects.create(name='Status')
+        self.label = Label.objects.create(name='Label')
+
+    def test_changes_are_published_after_commit(self):
+        """Saves, label changes and deletes publish one event each."""
+        backend = RecordingBackend()
+        with patch('task_manager.events.get_backend', return_value=backend):
+            with self.captureOnCommitCallbacks(execute=True):
+                task = Task.objects.create(name='Task', status=self.status,
+                                           creator=self.user)
+                task.labels.add(self.label)
+            self.assertEqual([event['event'] for event in backend.events],
+                             ['created', 'updated'])
+            self.assertEqual(backend.events[0]['task'], {
+                'id': task.pk, 'name': 'Task', 'status': self.status.pk,
+                'creator': self.user.pk, 'executor': None,
+                'labels': [self.label.pk]})
+            task_id = task.pk
+            with self.captureOnCommitCallbacks(execute=True):
+                task.delete()
+            self.assertEqual(backend.events[-1],
+                             {'event': 'deleted', 'task': {'id': task_id}})
+
+    def test_bulk_changes_are_published_as_one_batch(self):
+        """A bulk action publishes its events in a single batch."""
+        tasks = [Task.objects.create(name=f'Task {i}', status=self.status,
+                                     creator=self.user) for i in range(3)]
+        backend = RecordingBackend()
+        with patch('task_manager.events.get_backend', return_value=backend):
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk_add_labels(Task.objects.all(), [self.label.pk])
+        self.assertEqual(len(backend.batches), 1)
+        self.assertEqual(sorted(event['task']['id']
+                                for event in backend.events),
+                         sorted(task.pk for task in tasks))
+
+    def test_nothing_is_published_without_subscribers(self):
+        """Writes don't queue or load anything while no stream is open."""
+        backend = LocalBackend(broker)
+        with patch('task_manager.events.get_backend', return_value=backend), \
+                patch('task_manager.events._publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                task = Task.objects.create(name='Task', status=self.status,
+                                           creator=self.user)
+                task.labels.add(self.label)
+        publish.assert_not_called()
+
+    def test_task_matches_list_filters(self):
+        """Events are matched against the task list filters."""
+        task = {'id': 1, 'name': 'Task', 'status': 2, 'creator': 3,
+                'executor': None, 'labels': [4]}
+        self.assertTrue(task_matches(task, {}, 3))
+        self.assertTrue(task_matches(task, {'status': '2', 'label': '4',
+                                            'my_tasks': '1'}, 3))
+        self.assertFalse(task_matches(task, {'executor': '3'}, 3))
+        self.assertFalse(task_matches(task, {'label': '5'}, 3))
+        self.assertFalse(task_matches(task, {'my_tasks': '1'}, 5))
+
+    def test_feed_needs_asgi(self):
+        """Under WSGI the feed is off and the list doesn't open it."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('task_events'))
+        self.assertEqual(response.status_code, 204)
+        response = self.client.get(reverse('task_list'))
+        self.assertNotContains(response, 'EventSource')
+        with override_settings(EVENTS_ENABLED=True):
+            response = self.client.get(reverse('task_list'))
+        self.assertContains(response, 'new EventSource')
+
+    async def test_stream(self):
+        """The stream sends matching events and removals."""
+        response = await self.async_client.get(reverse('task_events'))
+        self.assertEqual(response.status_code, 403)
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('task_events'), {'status': str(self.status.pk)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        task = {'id': 1, 'name': 'Task', 'status': self.status.pk,
+                'creator': self.user.pk, 'executor': None, 'labels': []}
+        broker.deliver([{'event': 'created', 'task': dict(task, status=0)},
+                        {'event': 'created', 'task': task}])
+        broker.deliver([{'event': 'updated', 'task': dict(task, status=0)}])
+        self.assertEqual(await anext(stream),
+                         f'event: created\ndata: {json.dumps(task)}\n\n'
+                         .encode())
+        self.assertTrue((await anext(stream)).startswith(b'event: removed'))
+        await stream.aclose()
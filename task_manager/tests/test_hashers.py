@@ -0,0 +1,41 @@
+"""Tests for the configurable password hashers."""
+from django.contrib.auth.hashers import identify_hasher
+from django.test import override_settings
+from django.urls import reverse
+from .test_base import BaseTestCase
+
+PBKDF2 = 'task_manager.hashers.PBKDF2PasswordHasher'
+MD5 = 'django.contrib.auth.hashers.MD5PasswordHasher'
+
+
+@override_settings(PASSWORD_HASHERS=[PBKDF2, MD5],
+                   PASSWORD_PBKDF2_ITERATIONS=1000)
+class PasswordHasherTestCase(BaseTestCase):
+    """Class for password hasher test cases."""
+
+    def login(self):
+        return self.client.post(reverse('login'), {
+            'username': 'darth_vader', 'password': '123456'})
+
+    def iterations(self):
+        self.user.refresh_from_db()
+        hasher = identify_hasher(self.user.password)
+        return hasher.decode(self.user.password)['iterations']
+
+    def test_configured_iterations(self):
+        """New hashes use the configured cost."""
+        self.user.set_password('123456')
+        self.user.save()
+        self.assertEqual(self.iterations(), 1000)
+
+    def test_rehash_on_login(self):
+        """Login rehashes passwords of another hasher or cost."""
+        with self.settings(PASSWORD_HASHERS=[MD5]):
+            self.user.set_password('123456')
+            self.user.save()
+        self.assertEqual(self.login().status_code, 302)
+        self.assertEqual(self.iterations(), 1000)
+        self.client.logout()
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=1200):
+            self.assertEqual(self.login().status_code, 302)
+        self.assertEqual(self.iterations(), 1200)
@@ -0,0 +1,33 @@
+"""Tests for middleware of task manager app."""
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from .test_base import BaseTestCase
+
+TIMING_MIDDLEWARE = ['task_manager.middleware.RequestTimingMiddleware',
+                     *settings.MIDDLEWARE]
+
+
+@override_settings(MIDDLEWARE=TIMING_MIDDLEWARE)
+class RequestTimingMiddlewareTestCase(BaseTestCase):
+    """Class for request timing middleware test cases."""
+
+    def test_server_timing_header(self):
+        """Responses carry DB, template, view and total timings."""
+        self.login_user()
+        with self.assertLogs('task_manager.timing', 'INFO') as logs:
+            response = self.client.get(reverse('task_list'))
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'tpl;dur=', 'view;dur=', 'total;dur='):
+            self.assertIn(metric, header)
+        self.assertRegex(header, r'desc="\d+ queries"')
+        self.assertIn('path=/tasks/ status=200', logs.output[0])
+        self.assertNotIn('query_threshold_exceeded', logs.output[0])
+
+    @override_settings(REQUEST_TIMING_QUERY_THRESHOLD=0)
+    def test_query_threshold_warning(self):
+        """Requests over the query threshold are logged as warnings."""
+        self.login_user()
+        with self.assertLogs('task_manager.timing', 'WARNING') as logs:
+            self.client.get(reverse('task_list'))
+        self.assertIn('query_threshold_exceeded=true', logs.output[0])
@@ -0,0 +1,69 @@
+"""Tests for routing page reads to the read replica."""
+from django.test import modify_settings, override_settings
+from django.urls import reverse
+from task_manager.statuses.models import Status
+from .test_base import BaseTestCase
+
+
+@override_settings(READ_REPLICA='replica')
+@modify_settings(MIDDLEWARE={
+    'append': 'task_manager.middleware.ReplicaPinMiddleware'})
+class ReplicaRouterTestCase(BaseTestCase):
+    """Class for read replica routing test cases."""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        super().setUp()
+        Status.objects.create(name='Primary status')
+        Status.objects.using('replica').create(name='Replica status')
+        self.login_user()
+
+    def test_list_reads_replica(self):
+        """Read pages show the replica's rows, sync and async."""
+        for name in ('status_list', 'status_list_async'):
+            response = self.client.get(reverse(name))
+            self.assertContains(response, 'Replica status')
+            self.assertNotContains(response, 'Primary status')
+
+    def test_replica_pages_skip_conditional_get(self):
+        """Replica renders carry no ETag, primary renders keep it."""
+        response = self.client.get(reverse('status_list'))
+        self.assertNotIn('ETag', response)
+        response = self.client.get(reverse('status_list'),
+                                   HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 200)
+        self.client.cookies['pin_primary'] = '1'
+        response = self.client.get(reverse('status_list'))
+        self.assertIn('ETag', response)
+        response = self.client.get(reverse('status_list'),
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_views_read_primary(self):
+        """Authentication and edit forms use the primary."""
+        status = Status.objects.get(name='Primary status')
+        response = self.client.get(
+            reverse('status_update', kwargs={'pk': status.pk}))
+        self.assertContains(response, 'Primary status')
+
+    def test_write_pins_primary(self):
+        """After a write the client reads from the primary for a while."""
+        response = self.client.post(reverse('status_create'),
+                                    {'name': 'New status'})
+        self.assertEqual(response.cookies['pin_primary']['max-age'], 10)
+        response = self.client.get(reverse('status_list'))
+        self.assertContains(response, 'New status')
+        self.assertFalse(Status.objects.using('replica').filter(
+            name='New status').exists())
+        self.client.cookies.pop('pin_primary')
+        response = self.client.get(reverse('status_list'))
+        self.assertNotContains(response, 'New status')
+
+    @override_settings(READ_REPLICA=None)
+    def test_without_replica(self):
+        """Without a replica every read goes to the primary."""
+        response = self.client.post(reverse('status_create'),
+                                    {'name': 'New status'})
+        self.assertNotIn('pin_primary', response.cookies)
+        response = self.client.get(reverse('status_list'))
+        self.assertContains(response, 'Primary status')
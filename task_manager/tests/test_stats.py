@@ -0,0 +1,82 @@
+"""Tests for task statistics in task manager app."""
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import bulk_create_tasks
+from task_manager.tasks.models import (Task, TaskDailyCount,
+                                       TaskStatusExecutorCount)
+from task_manager.versions import get_version
+from .test_base import BaseTestCase
+
+
+class TaskStatsTestCase(BaseTestCase):
+    """Class for task statistics test cases."""
+
+    def setUp(self):
+        """Setup for statistics tests."""
+        super().setUp()
+        self.status1 = Status.objects.create(name='Status 1')
+        self.status2 = Status.objects.create(name='Status 2')
+        self.task = Task.objects.create(name='Task', status=self.status1,
+                                        creator=self.user,
+                                        executor=self.user2)
+
+    def pair_counts(self):
+        """Return non-empty status × executor counts."""
+        return {(row.status_id, row.executor_id): row.count
+                for row in TaskStatusExecutorCount.objects.all()
+                if row.count}
+
+    def daily_counts(self):
+        """Return non-empty per-day counts."""
+        return dict(TaskDailyCount.objects.filter(count__gt=0)
+                    .values_list('day', 'count'))
+
+    def test_summary_follows_tasks(self):
+        """Summary rows follow task saves and deletes."""
+        today = timezone.localdate()
+        self.assertEqual(self.pair_counts(),
+                         {(self.status1.pk, self.user2.pk): 1})
+        self.task.status = self.status2
+        self.task.executor = None
+        self.task.save()
+        self.assertEqual(self.pair_counts(), {(self.status2.pk, None): 1})
+        bulk_create_tasks(
+            [Task(name=f'Bulk {i}', status=self.status2, creator=self.user)
+             for i in range(2)], [[], []])
+        self.assertEqual(self.pair_counts(), {(self.status2.pk, None): 3})
+        self.assertEqual(self.daily_counts(), {today: 3})
+        self.task.delete()
+        self.assertEqual(self.pair_counts(), {(self.status2.pk, None): 2})
+        self.assertEqual(self.daily_counts(), {today: 2})
+
+    def test_rebuild_command(self):
+        """The summary tables are rebuilt from the tasks."""
+        TaskStatusExecutorCount.objects.update(count=42)
+        TaskDailyCount.objects.all().delete()
+        version = get_version('tasks')
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_task_stats', stdout=StringIO())
+        self.assertNotEqual(get_version('tasks'), version)
+        self.assertEqual(self.pair_counts(),
+                         {(self.status1.pk, self.user2.pk): 1})
+        self.assertEqual(self.daily_counts(), {timezone.localdate(): 1})
+
+    def test_dashboard(self):
+        """Dashboard renders the summary without scanning the tasks."""
+        label = Label.objects.create(name='Label')
+        self.task.labels.add(label)
+        self.login_user()
+        self.client.get(reverse('task_stats'))
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('task_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['executor_rows'],
+                         [('Luke Skywalker', [1, 0], 1)])
+        self.assertEqual(response.context['status_totals'], [1, 0, 1])
+        self.assertEqual(list(response.context['labels']), [('Label', 1)])
+        self.assertEqual(response.context['daily'][0][1], 1)
+        self.assertEqual(response.context['weekly'][0][1], 1)
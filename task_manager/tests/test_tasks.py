@@ -1,8 +1,18 @@
 """Tests for task functionality in task manager app."""
+import csv
+import json
+from unittest.mock import Mock
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from task_manager.tasks.models import Task
+from task_manager.tasks.bulk import bulk_delete_tasks
+from task_manager.tasks.models import Task, TaskLabel
 from task_manager.statuses.models import Status
 from task_manager.labels.models import Label
+from task_manager.users.models import UserTaskStats
 from .test_base import BaseTestCase
 
 
@@ -350,3 +360,362 @@ class TaskTestCase(BaseTestCase):
             response = self.client.get(url, follow=True)
             self.assertEqual(response.status_code, 200)
             self.assertIn('login', response.request['PATH_INFO'])
+
+    def test_task_list_query_count_is_constant(self):
+        """Task list query count does not grow with the number of tasks."""
+        self.login_user()
+        label = Label.objects.create(name='Query Label')
+        self.task1.labels.add(label)
+
+        def count_list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('task_list'))
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        count_list_queries()  # warm up the cached filter choices
+        baseline = count_list_queries()
+        for i in range(10):
+            task = Task.objects.create(
+                name=f'Extra Task {i}',
+                status=self.status2,
+                creator=self.user2,
+                executor=self.user2 if i % 2 else None
+            )
+            task.labels.add(label)
+        self.assertEqual(count_list_queries(), baseline)
+
+    def test_task_list_cursor_pagination(self):
+        """Task list pages with cursors and keeps the filters."""
+        self.login_user()
+        task3 = Task.objects.create(
+            name='Task 3',
+            status=self.status1,
+            creator=self.user,
+            executor=self.user
+        )
+        url = f"{reverse('task_list')}?executor={self.user.id}&page_size=1"
+
+        response = self.client.get(url)
+        page = response.context['page_obj']
+        self.assertEqual([t.name for t in response.context['tasks']],
+                         ['Task 1'])
+        self.assertFalse(page.has_previous())
+        self.assertIn(f'executor={self.user.id}', page.next_url)
+
+        response = self.client.get(reverse('task_list') + page.next_url)
+        page = response.context['page_obj']
+        self.assertEqual([t.name for t in response.context['tasks']],
+                         ['Task 2'])
+
+        response = self.client.get(reverse('task_list') + page.next_url)
+        page = response.context['page_obj']
+        self.assertEqual(list(response.context['tasks']), [task3])
+        self.assertFalse(page.has_next())
+
+        response = self.client.get(reverse('task_list') + page.previous_url)
+        self.assertEqual([t.name for t in response.context['tasks']],
+                         ['Task 2'])
+
+    def test_task_list_page_size_is_bounded(self):
+        """Requested page size is capped by the view maximum."""
+        self.login_user()
+        response = self.client.get(f"{reverse('task_list')}?page_size=1000")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['view'].get_paginate_by(None), 200)
+
+    def test_task_filters_use_composite_indexes(self):
+        """Query planner picks the composite indexes for list filters."""
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest('EXPLAIN output is only checked on SQLite/Postgres')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+        ordered = Task.objects.order_by('created_at', 'id')
+        cases = [
+            (ordered.filter(status_id=self.status1.id),
+             'task_status_created_idx'),
+            (ordered.filter(executor_id=self.user.id),
+             'task_executor_created_idx'),
+            (ordered.filter(creator_id=self.user.id),
+             'task_creator_created_idx'),
+            (ordered.filter(labels__id=1), 'tasklabel_label_task_idx'),
+        ]
+        for queryset, index_name in cases:
+            with self.subTest(index=index_name):
+                self.assertIn(index_name, queryset.explain())
+
+    def test_task_export_csv(self):
+        """CSV export streams the filtered tasks."""
+        self.login_user()
+        label = Label.objects.create(name='Export Label')
+        self.task1.labels.add(label)
+        response = self.client.get(
+            reverse('task_export'),
+            {'format': 'csv', 'status': self.status1.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['name'], 'Task 1')
+        self.assertEqual(rows[0]['status'], 'Status 1')
+        self.assertEqual(rows[0]['executor'], 'Darth Vader')
+        self.assertEqual(rows[0]['labels'], 'Export Label')
+
+    def test_task_export_jsonl_query_count(self):
+        """JSONL export loads labels without a query per task."""
+        self.login_user()
+        label = Label.objects.create(name='Export Label')
+        for task in (self.task1, self.task2):
+            task.labels.add(label)
+
+        def export():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('task_export'),
+                                           {'format': 'jsonl'})
+                lines = b''.join(response.streaming_content).splitlines()
+            return [json.loads(line) for line in lines], len(queries)
+
+        rows, baseline = export()
+        self.assertEqual([row['labels'] for row in rows],
+                         [['Export Label'], ['Export Label']])
+        for i in range(5):
+            Task.objects.create(name=f'Export Task {i}',
+                                status=self.status1,
+                                creator=self.user).labels.add(label)
+        rows, queries = export()
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(queries, baseline)
+
+    def test_task_export_unknown_format(self):
+        """Unknown export format is rejected."""
+        self.login_user()
+        response = self.client.get(reverse('task_export'), {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_search(self):
+        """Full-text search ranks matches and composes with filters."""
+        self.login_user()
+        Task.objects.create(name='Fix login form',
+                            description='Login breaks on the login page',
+                            status=self.status1, creator=self.user)
+        Task.objects.create(name='Write docs',
+                            description='Mention the login page',
+                            status=self.status1, creator=self.user)
+        Task.objects.create(name='Login audit', status=self.status2,
+                            creator=self.user)
+
+        response = self.client.get(reverse('task_list'), {'q': 'login'})
+        names = [task.name for task in response.context['tasks']]
+        self.assertEqual(names[0], 'Fix login form')
+        self.assertCountEqual(names, ['Fix login form', 'Write docs',
+                                      'Login audit'])
+
+        response = self.client.get(reverse('task_list'), {
+            'q': 'logi', 'status': self.status2.id})
+        self.assertEqual([task.name for task in response.context['tasks']],
+                         ['Login audit'])
+
+        response = self.client.get(reverse('task_list'),
+                                   {'q': '"unbalanced AND ('})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['tasks']), 0)
+
+    def test_task_search_follows_updates_and_pages(self):
+        """Search index follows edits and pages through ranked results."""
+        self.login_user()
+        self.task1.description = 'Renamed description with keyword'
+        self.task1.save()
+        for i in range(3):
+            Task.objects.create(name=f'Keyword {i}', status=self.status1,
+                                creator=self.user)
+        self.task2.delete()
+
+        url = reverse('task_list')
+        seen = []
+        response = self.client.get(url, {'q': 'keyword', 'page_size': 1})
+        while True:
+            seen.extend(task.name for task in response.context['tasks'])
+            page = response.context['page_obj']
+            if not page.has_next():
+                break
+            response = self.client.get(url + page.next_url)
+        self.assertCountEqual(seen, ['Task 1', 'Keyword 0', 'Keyword 1',
+                                     'Keyword 2'])
+        self.assertFalse(
+            Task.objects.search('Description 2').exists())
+
+    def test_task_bulk_status_and_executor(self):
+        """Bulk actions update the checked tasks and their counters."""
+        self.login_user()
+        url = reverse('task_bulk')
+        response = self.client.post(url, {
+            'action': 'set_status', 'status': self.status2.pk,
+            'tasks': [self.task1.pk, self.task2.pk]})
+        self.assertRedirects(response, reverse('task_list'))
+        self.assertEqual(
+            Task.objects.filter(status=self.status2).count(), 2)
+        self.status1.refresh_from_db()
+        self.status2.refresh_from_db()
+        self.assertEqual((self.status1.task_count, self.status2.task_count),
+                         (0, 2))
+        self.client.post(url + f'?status={self.status2.pk}', {
+            'action': 'set_executor', 'executor': '', 'select_all': '1'})
+        self.assertFalse(Task.objects.filter(executor__isnull=False).exists())
+
+    def test_task_bulk_labels(self):
+        """Labels are linked and unlinked in bulk."""
+        self.login_user()
+        label1 = Label.objects.create(name='Label 1')
+        label2 = Label.objects.create(name='Label 2')
+        self.task1.labels.add(label1)
+        url = reverse('task_bulk')
+        self.client.post(url, {'action': 'add_labels', 'select_all': '1',
+                               'labels': [label1.pk, label2.pk]})
+        self.assertEqual(
+            sorted(self.task2.labels.values_list('name', flat=True)),
+            ['Label 1', 'Label 2'])
+        label1.refresh_from_db()
+        self.assertEqual(label1.task_count, 2)
+        self.client.post(url, {'action': 'remove_labels',
+                               'tasks': [self.task1.pk],
+                               'labels': [label1.pk]})
+        self.assertEqual(list(self.task1.labels.all()), [label2])
+        label1.refresh_from_db()
+        self.assertEqual(label1.task_count, 1)
+
+    def test_task_bulk_delete_only_own_tasks(self):
+        """Bulk delete removes only the tasks created by the user."""
+        self.login_user()
+        self.task2.labels.add(Label.objects.create(name='Label'))
+        response = self.client.post(reverse('task_bulk'), {
+            'action': 'delete', 'tasks': [self.task1.pk, self.task2.pk]},
+            follow=True)
+        self.assertEqual(list(Task.objects.all()), [self.task2])
+        self.assertEqual([message.level_tag for message
+                          in response.context['messages']],
+                         ['success', 'error'])
+        self.status1.refresh_from_db()
+        self.assertEqual(self.status1.task_count, 0)
+
+    def test_task_bulk_delete_skips_signals(self):
+        """Bulk delete sends no per-task signals and moves every counter
+        exactly once."""
+        label = Label.objects.create(name='Label')
+        self.task1.labels.add(label)
+        self.task2.labels.add(label)
+        receiver = Mock()
+        post_delete.connect(receiver, sender=Task)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Task)
+        self.assertEqual(bulk_delete_tasks(Task.objects.all()), 2)
+        receiver.assert_not_called()
+        self.assertFalse(TaskLabel.objects.exists())
+        for obj in (self.status1, self.status2, label):
+            obj.refresh_from_db()
+            self.assertEqual(obj.task_count, 0)
+        self.assertEqual(UserTaskStats.objects.get(user=self.user)
+                         .assigned_count, 0)
+
+    def test_task_bulk_requires_selection(self):
+        """Bulk actions need checked tasks or the select all flag."""
+        self.login_user()
+        response = self.client.post(reverse('task_bulk'),
+                                    {'action': 'delete'}, follow=True)
+        self.assertEqual([message.level_tag for message
+                          in response.context['messages']], ['error'])
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_task_fragments_are_cached_per_update(self):
+        """Rows and the detail card are reused until the task changes."""
+        self.login_user()
+        list_url = reverse('task_list')
+        detail_url = reverse('task_detail', kwargs={'pk': self.task1.pk})
+        self.client.get(list_url)
+        self.client.get(detail_url)
+        # A write that bypasses updated_at keeps serving the fragments.
+        Task.objects.filter(pk=self.task1.pk).update(name='Stale name')
+        self.assertContains(self.client.get(list_url), 'Task 1')
+        self.assertContains(self.client.get(detail_url), 'Task 1')
+
+        label = Label.objects.create(name='Fresh label')
+        self.task1.refresh_from_db()
+        self.task1.labels.add(label)
+        response = self.client.get(detail_url)
+        self.assertContains(response, 'Stale name')
+        self.assertContains(response, 'Fresh label')
+        self.task1.refresh_from_db()
+        self.task1.name = 'Renamed task'
+        self.task1.save()
+        self.assertContains(self.client.get(list_url), 'Renamed task')
+
+    def test_task_fragments_follow_renames_on_other_workers(self):
+        """A status renamed through another worker's cache is shown in
+        the cached rows and cards right away."""
+        self.login_user()
+        urls = (reverse('task_list'),
+                reverse('task_detail', kwargs={'pk': self.task1.pk}))
+        for url in urls:
+            self.client.get(url)
+        other_worker = {alias: dict(options, LOCATION='other-worker')
+                        for alias, options in settings.CACHES.items()}
+        with override_settings(CACHES=other_worker):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.task1.status.name = 'Renamed status'
+                self.task1.status.save()
+        for url in urls:
+            self.assertContains(self.client.get(url), 'Renamed status')
+
+    def test_task_update_conflict(self):
+        """A stale form is rejected instead of overwriting an edit."""
+        self.login_user()
+        url = reverse('task_update', kwargs={'pk': self.task1.pk})
+        version = self.client.get(url).context['form'].initial['version']
+        data = {'name': 'First edit', 'status': self.status1.id,
+                'version': version}
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        self.task1.refresh_from_db()
+        self.assertGreater(self.task1.version, version)
+
+        data['name'] = 'Second edit'
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 409)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.name, 'First edit')
+        self.assertEqual(response.context['form']['version'].value(),
+                         self.task1.version)
+        data['version'] = self.task1.version
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.name, 'Second edit')
+
+    def test_task_pages_conditional_get(self):
+        """Unchanged task pages answer 304 until the task changes."""
+        self.login_user()
+        for url in (reverse('task_list'),
+                    reverse('task_detail', kwargs={'pk': self.task1.pk})):
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.task1.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_get_across_workers(self):
+        """A write handled by a worker with its own cache changes the
+        ETags served by every other worker."""
+        self.login_user()
+        url = reverse('task_detail', kwargs={'pk': self.task1.pk})
+        etag = self.client.get(url)['ETag']
+        other_worker = {alias: dict(options, LOCATION='other-worker')
+                        for alias, options in settings.CACHES.items()}
+        with override_settings(CACHES=other_worker):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.status2.name = 'Renamed status'
+                self.status2.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
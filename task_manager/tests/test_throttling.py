@@ -0,0 +1,69 @@
+"""Tests for login throttling and metrics."""
+from django.test import override_settings
+from django.urls import reverse
+from task_manager.throttling import SlidingWindowThrottle
+from .test_base import BaseTestCase
+
+
+@override_settings(LOGIN_THROTTLE_USERNAME_LIMIT=3,
+                   LOGIN_THROTTLE_IP_LIMIT=5, METRICS_TOKEN='secret')
+class LoginThrottleTestCase(BaseTestCase):
+    """Class for login throttling test cases."""
+
+    def login(self, username='darth_vader', password='wrong', **extra):
+        return self.client.post(reverse('login'), {
+            'username': username, 'password': password}, **extra)
+
+    def test_sliding_window(self):
+        """Hits of the previous window fade out as the window slides."""
+        throttle = SlidingWindowThrottle('test', 2, 100)
+        throttle.hit('a', now=1090)
+        throttle.hit('a', now=1095)
+        self.assertEqual(throttle.retry_after('a', now=1099), 1)
+        self.assertEqual(throttle.retry_after('a', now=1110), 0)
+        throttle.hit('a', now=1110)
+        self.assertEqual(throttle.retry_after('a', now=1120), 30)
+        self.assertEqual(throttle.retry_after('a', now=1151), 0)
+        self.assertEqual(throttle.retry_after('b', now=1120), 0)
+
+    def test_username_limit(self):
+        """Over-limit attempts get 429 without checking the password."""
+        for __ in range(3):
+            self.assertEqual(self.login().status_code, 200)
+        response = self.login(password='123456')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertNotIn('_auth_user_id', self.client.session)
+        self.assertEqual(self.login('luke', '54321').status_code, 302)
+
+    def test_ip_limit(self):
+        """Guessing different usernames is limited per address."""
+        for number in range(5):
+            self.login(f'user{number}')
+        self.assertEqual(self.login('luke', '54321').status_code, 429)
+        response = self.login('luke', '54321', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 302)
+
+    def test_success_resets_username(self):
+        """A successful login clears the attempts against the user."""
+        self.login()
+        self.login()
+        self.assertEqual(self.login(password='123456').status_code, 302)
+        self.client.logout()
+        for __ in range(2):
+            self.assertEqual(self.login().status_code, 200)
+
+    def test_metrics(self):
+        """Counters are readable with the token or by staff."""
+        self.login()
+        for __ in range(4):
+            self.login('luke')
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('login_attempts_total 5\n', body)
+        self.assertIn('login_failures_total 4\n', body)
+        self.assertIn('login_throttled_total{scope="username"} 1\n', body)
+        self.assertIn('login_throttled_total{scope="ip"} 0\n', body)
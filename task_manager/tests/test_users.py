@@ -143,6 +143,18 @@ class UserTestCase(BaseTestCase):
         self.assertContains(response, 'Darth')
         self.assertContains(response, 'Luke')
 
+    def test_user_list_conditional_get(self):
+        """User list answers 304 until a user changes."""
+        url = reverse('user_list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.user2.first_name = 'Leia'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user2.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Leia')
+
     def test_login_logout(self):
         """Test login and logout functionality."""
         login_data = {
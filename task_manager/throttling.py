@@ -0,0 +1,123 @@
+"""Sliding-window rate limiting of login attempts.
+
+Attempts are counted in Django's cache in fixed windows. The count used
+for the limit is the current window plus the previous window weighted by
+how much of it still overlaps the sliding window, which approximates a
+true sliding log with two keys per client. Counting is not transactional,
+so concurrent attempts may slip a little over the limit.
+"""
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from task_manager import metrics
+
+USERNAME = 'username'
+IP = 'ip'
+
+
+class SlidingWindowThrottle:
+    """At most ``limit`` hits per ``window`` seconds for each identifier."""
+
+    def __init__(self, scope, limit, window, cache_alias='default'):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.cache = caches[cache_alias]
+
+    def _keys(self, ident, now):
+        digest = hashlib.md5(ident.encode(),
+                             usedforsecurity=False).hexdigest()
+        index, elapsed = divmod(now, self.window)
+        index = int(index)
+        key = f'throttle:{self.scope}:{digest}:{{}}'
+        return key.format(index - 1), key.format(index), elapsed
+
+    def retry_after(self, ident, now=None):
+        """Seconds until ``ident`` may try again, 0 if it may now."""
+        now = time.time() if now is None else now
+        previous_key, current_key, elapsed = self._keys(ident, now)
+        counts = self.cache.get_many([previous_key, current_key])
+        previous = counts.get(previous_key, 0)
+        current = counts.get(current_key, 0)
+        weight = 1 - elapsed / self.window
+        if previous * weight + current < self.limit:
+            return 0
+        if current >= self.limit:
+            # The current window's hits alone are over the limit: wait
+            # for it to end and for them to fade out of the next one.
+            wait = (self.window - elapsed
+                    + self.window * (1 - self.limit / current))
+        else:
+            wait = (self.window * (1 - (self.limit - current) / previous)
+                    - elapsed)
+        return max(1, math.ceil(wait))
+
+    def hit(self, ident, now=None):
+        now = time.time() if now is None else now
+        __, current_key, __ = self._keys(ident, now)
+        # Keep the window around while it still counts as the previous.
+        self.cache.add(current_key, 0, self.window * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            # Expired between add and incr.
+            self.cache.add(current_key, 1, self.window * 2)
+
+    def reset(self, ident, now=None):
+        now = time.time() if now is None else now
+        self.cache.delete_many(self._keys(ident, now)[:2])
+
+
+def get_login_throttles():
+    window = settings.LOGIN_THROTTLE_WINDOW
+    cache_alias = settings.THROTTLE_CACHE
+    return {
+        USERNAME: SlidingWindowThrottle(
+            USERNAME, settings.LOGIN_THROTTLE_USERNAME_LIMIT, window,
+            cache_alias),
+        IP: SlidingWindowThrottle(
+            IP, settings.LOGIN_THROTTLE_IP_LIMIT, window, cache_alias),
+    }
+
+
+def client_ip(request):
+    """The client address, taken from ``X-Forwarded-For`` when the app
+    runs behind ``LOGIN_THROTTLE_PROXY_COUNT`` trusted proxies."""
+    proxies = settings.LOGIN_THROTTLE_PROXY_COUNT
+    if proxies:
+        forwarded = [address.strip() for address in
+                     request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+                     if address.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _login_idents(request, username):
+    return {USERNAME: (username or '').lower(), IP: client_ip(request)}
+
+
+def throttle_login(request, username):
+    """Count a login attempt and return the seconds the client has to
+    wait, or 0 if the attempt may go ahead."""
+    metrics.LOGIN_ATTEMPTS.inc()
+    throttles = get_login_throttles()
+    idents = _login_idents(request, username)
+    for scope, throttle in throttles.items():
+        retry_after = throttle.retry_after(idents[scope])
+        if retry_after:
+            metrics.LOGIN_THROTTLED.inc(scope)
+            return retry_after
+    for scope, throttle in throttles.items():
+        throttle.hit(idents[scope])
+    return 0
+
+
+def login_succeeded(request, username):
+    """Forget the attempts counted against ``username``."""
+    get_login_throttles()[USERNAME].reset(
+        _login_idents(request, username)[USERNAME])
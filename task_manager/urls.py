@@ -12,8 +12,10 @@ urlpatterns = [
     path('statuses/', include('task_manager.statuses.urls')),
     path('labels/', include('task_manager.labels.urls')),
     path('tasks/', include('task_manager.tasks.urls')),
+    path('api/', include('task_manager.api.urls')),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
+    path('metrics/', views.metrics_view, name='metrics'),
     path('i18n/', include('django.conf.urls.i18n')),
 ]
 
@@ -0,0 +1,14 @@
+"""models.py module for the task manager app."""
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class UserTaskStats(models.Model):
+    """Denormalized task counters of a user."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE,
+                                primary_key=True, related_name='task_stats')
+    created_count = models.IntegerField(default=0)
+    assigned_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return str(self.user)
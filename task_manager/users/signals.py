@@ -0,0 +1,13 @@
+"""signals.py module for the task manager app."""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import UserTaskStats
+
+
+@receiver(post_save, sender=User)
+def create_task_stats(sender, instance, created, raw=False, **kwargs):
+    """Every user gets a counters row when registered."""
+    if created and not raw:
+        UserTaskStats.objects.get_or_create(user=instance)
@@ -1,10 +1,14 @@
 """urls.py module for the task manager app."""
 from django.urls import path
+from task_manager.mixins import read_view
 from . import views
 
 urlpatterns = [
     path('',
-         views.UserListView.as_view(), name='user_list'),
+         read_view(views.UserListView, views.UserListAsyncView),
+         name='user_list'),
+    path('async/',
+         views.UserListAsyncView.as_view(), name='user_list_async'),
     path('create/',
          views.UserCreateView.as_view(), name='user_create'),
     path('<int:pk>/update/',
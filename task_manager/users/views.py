@@ -10,16 +10,26 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from .forms import CustomUserCreationForm, UserUpdateForm
 from django.contrib.auth import logout
 from django.utils.translation import gettext_lazy as _, pgettext
-from task_manager.mixins import (CustomLoginRequiredMixin,
+from task_manager.mixins import (ConditionalGetMixin,
+                                 CustomLoginRequiredMixin, ReplicaReadMixin,
                                  UserOwnershipRequiredMixin)
+from task_manager.pagination import (AsyncKeysetListMixin,
+                                     KeysetPaginationMixin)
 from django.db.models import ProtectedError
 
 
-class UserListView(ListView):
+class UserListView(ConditionalGetMixin, ReplicaReadMixin,
+                   KeysetPaginationMixin, ListView):
     """Class representing UserListView logic."""
-    model = User
+    queryset = User.objects.select_related('task_stats')
+    cursor_ordering = ('date_joined', 'id')
     template_name = 'users/users.html'
     context_object_name = 'users'
+    etag_versions = ('users', 'tasks')
+
+
+class UserListAsyncView(AsyncKeysetListMixin, UserListView):
+    """Async variant of UserListView."""
 
 
 class UserCreateView(SuccessMessageMixin, CreateView):
@@ -81,6 +91,11 @@ class UserDeleteView(CustomLoginRequiredMixin, UserOwnershipRequiredMixin,
     def post(self, request, *args, **kwargs):
         """Handle POST-request"""
         self.object = self.get_object()
+        stats = getattr(self.object, 'task_stats', None)
+        if stats and (stats.created_count or stats.assigned_count):
+            messages.error(self.request,
+                           _('Cannot delete a user because it is in use'))
+            return redirect('user_list')
 
         try:
             self.object.delete()
@@ -0,0 +1,40 @@
+"""Per-table version stamps for conditional GET and cache keys.
+
+A stamp is a counter in the ``TableVersion`` table, moved on by the
+signal handlers in ``task_manager.signals`` (and by the bulk helpers,
+the counter and statistics rebuilds and the seeding command, which send
+no signals) in the writing transaction. Every worker reads the same
+committed stamps, so a reader never pairs a new stamp with old rows of
+the primary; pages read from a replica don't use the stamps for
+conditional GET. The stamps are always read from the primary.
+
+Bumping a stamp updates its row, so concurrent writes to one table
+queue on that row until the writing transaction ends.
+"""
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+
+from task_manager.models import TableVersion
+
+
+def get_versions(*names):
+    """Return ``{name: stamp}`` with one query, 0 for unknown tables."""
+    found = dict(TableVersion.objects.filter(name__in=names)
+                 .values_list('name', 'version'))
+    return {name: found.get(name, 0) for name in names}
+
+
+def get_version(name):
+    return get_versions(name)[name]
+
+
+def bump_versions(*names, using=None):
+    """Move the stamps of ``names`` on within the current transaction,
+    so that they commit together with the write."""
+    names = sorted(set(names))
+    versions = TableVersion.objects.db_manager(using or DEFAULT_DB_ALIAS)
+    bumped = versions.filter(name__in=names).update(
+        version=F('version') + 1)
+    if bumped < len(names):
+        versions.bulk_create([TableVersion(name=name, version=1)
+                              for name in names], ignore_conflicts=True)
@@ -1,9 +1,16 @@
+import hmac
+
 from django.shortcuts import render, redirect
+from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
-from django.views.decorators.http import require_POST
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET, require_POST
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import metrics
+from task_manager.throttling import login_succeeded, throttle_login
+
 
 def index_view(request):
     return render(request, 'index.html')
@@ -14,13 +21,25 @@ def login_view(request):
         username = request.POST.get('username')
         password = request.POST.get('password')
 
+        # Rejected before authenticate() so that floods of guesses don't
+        # cost a password hash each.
+        retry_after = throttle_login(request, username)
+        if retry_after:
+            messages.error(request, _('Too many login attempts. '
+                                      'Please try again later.'))
+            response = render(request, 'login.html', status=429)
+            response['Retry-After'] = str(retry_after)
+            return response
+
         user = authenticate(request, username=username, password=password)
 
         if user is not None:
             login(request, user)
+            login_succeeded(request, username)
             messages.success(request, _('You are logged in'))
             return redirect('home')
         else:
+            metrics.LOGIN_FAILURES.inc()
             messages.error(request, _('Please enter a correct username '
                                     'and password. Note that both fields '
                                       'may be case-sensitive.'))
@@ -33,3 +52,17 @@ def logout_view(request):
     logout(request)
     messages.info(request, _('You are logged out'))
     return redirect('home')
+
+
+@require_GET
+def metrics_view(request):
+    """Counters for Prometheus, readable with the ``METRICS_TOKEN``
+    bearer token or by staff users."""
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get('Authorization', '')
+    if not (token and hmac.compare_digest(authorization.encode(),
+                                          f'Bearer {token}'.encode())
+            or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render_metrics(),
+                        content_type='text/plain; version=0.0.4')